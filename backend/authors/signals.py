@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.utils.cache import invalidate_tags
+from users.models import User
+
+from .models import Author
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def author_changed(sender, instance, **kwargs):
+    invalidate_tags("authors")
+
+
+@receiver(post_save, sender=User)
+def author_user_changed(sender, instance, update_fields=None, **kwargs):
+    # Logins only save last_login, which no cached payload shows
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_tags("authors")
@@ -1,3 +1,4 @@
+from django.db.models import Max
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -5,14 +6,23 @@ from rest_framework import status, permissions
 from .models import Author
 from .serializers import AuthorSerializer
 from users.serializers import UserProfileSerializer
+from core.utils.conditional import ConditionalGetMixin
 
 
-class AuthorListView(APIView):
+class AuthorListView(ConditionalGetMixin, APIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    conditional_aggregates = {
+        **ConditionalGetMixin.conditional_aggregates,
+        # user_details shows the user's name and email
+        "user_updated_at": Max("user__updated_at"),
+    }
+
+    def get_conditional_queryset(self, request):
+        return Author.objects.all()
 
     def get(self, request):
         """List all authors"""
-        authors = Author.objects.all()
+        authors = Author.objects.select_related("user")
         serializer = AuthorSerializer(authors, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
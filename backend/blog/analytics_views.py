@@ -1,62 +1,94 @@
 import calendar
+from datetime import datetime, time, timedelta
+
 from rest_framework.views import APIView
 from rest_framework import status, permissions
 from rest_framework.response import Response
 from django.utils import timezone
-from django.db.models import Sum, Avg
+from django.utils.dateparse import parse_date
+from django.db.models import Avg, Count, FloatField, Q, Sum
+from django.db.models.functions import Coalesce, TruncDay, TruncMonth, TruncWeek
 from blog.models import Article
-from blog.serializers import ArticleSerializer
+from blog.rollups import views_by_bucket
+from blog.trending import get_trending_ids, ranked
+from blog.serializers import select_article_representation
+from core.utils.cache import CachedResponseMixin
+from core.utils.pagination import CustomPagination
 from authors.models import Author
-from datetime import timedelta
 
 
-from django.db.models import Sum, Avg
-from django.utils import timezone
-from datetime import timedelta
-import calendar
+BUCKETS = {
+    "day": TruncDay,
+    "week": TruncWeek,
+    "month": TruncMonth,
+}
+
+# Legacy ?time_range= values: bucket size and how many buckets back from today
+TIME_RANGES = {
+    "daily": ("day", 7),
+    "weekly": ("week", 4),
+    "monthly": ("month", 6),
+}
+
+MAX_BUCKETS = 1000
+
+
+def parse_date_param(request, name):
+    value = request.GET.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f"{name} must be a date in YYYY-MM-DD format")
+    return parsed
+
 
 class ViewAnalyticsAPIView(APIView):
     # permission_classes = [permissions.IsAdminUser]
     
     def get(self, request):
         try:
-            # Get time range from query params (default to 'monthly')
-            time_range = request.GET.get('time_range', 'monthly')  # daily, weekly, monthly
+            # Either ?time_range=daily|weekly|monthly (default monthly) or an
+            # explicit ?start=YYYY-MM-DD&end=YYYY-MM-DD&bucket=day|week|month
+            time_range = request.GET.get('time_range', 'monthly')
+            try:
+                start, end, bucket = self.get_range(request, time_range)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
             # Base queryset for all-time data
             all_articles = Article.objects.filter(is_deleted=False)
             
             # 1. KPI Metrics (All-time) - ALWAYS return these
-            total_views = all_articles.aggregate(total=Sum("view_count"))["total"] or 0
-            avg_views = all_articles.aggregate(avg=Avg("view_count"))["avg"] or 0
+            kpis = all_articles.aggregate(total=Sum("view_count"), avg=Avg("view_count"))
+            total_views = kpis["total"] or 0
+            avg_views = kpis["avg"] or 0
             
             # 2. Most/Least Viewed Articles (All-time) - ALWAYS return these
-            most_viewed = all_articles.order_by("-view_count")[:5]
-            least_viewed = all_articles.order_by("view_count")[:5]
-            
-            # 3. Time-based data - SIMPLIFY to match frontend expectations
-            # Frontend expects: last 7 days for daily, last 4 weeks for weekly, last 6 months for monthly
-            chart_data = []
-            time_range_kpis = {}
+            listing, serializer_class = select_article_representation(
+                request, all_articles.for_listing(), default="compact"
+            )
+            most_viewed = listing.order_by("-view_count")[:5]
+            least_viewed = listing.order_by("view_count")[:5]
             
-            if time_range == 'daily':
-                chart_data, time_range_kpis = self.get_simple_daily_data(all_articles)
-            elif time_range == 'weekly':
-                chart_data, time_range_kpis = self.get_simple_weekly_data(all_articles)
-            else:  # monthly
-                chart_data, time_range_kpis = self.get_simple_monthly_data(all_articles)
+            # 3. Time-based data, one GROUP BY query whatever the range length
+            chart_data, time_range_kpis = self.get_chart_data(all_articles, start, end, bucket)
             
             data = {
                 # All-time data - ALWAYS include
                 "total_views": total_views,
                 "average_views": round(avg_views, 2),
-                "most_viewed": ArticleSerializer(most_viewed, many=True).data,
-                "least_viewed": ArticleSerializer(least_viewed, many=True).data,
+                "most_viewed": serializer_class(most_viewed, many=True).data,
+                "least_viewed": serializer_class(least_viewed, many=True).data,
                 
                 # Time-based data
                 "chart_data": chart_data,
                 "time_range_kpis": time_range_kpis,
                 "time_range": time_range,
+                "bucket": bucket,
             }
             
             return Response(data, status=status.HTTP_200_OK)
@@ -65,180 +97,144 @@ class ViewAnalyticsAPIView(APIView):
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-    
-    def get_simple_daily_data(self, queryset):
-        """Get simple daily data for last 7 days"""
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=6)  # Last 7 days
-        
-        # Get articles published in the last 7 days
-        recent_articles = queryset.filter(
-            created_at__date__range=[start_date.date(), end_date.date()]
+
+    def get_range(self, request, time_range):
+        """Resolve the request into (start date, end date, bucket), both dates inclusive."""
+        default_bucket, count = TIME_RANGES.get(time_range, TIME_RANGES["monthly"])
+        bucket = request.GET.get("bucket", default_bucket)
+        if bucket not in BUCKETS:
+            raise ValueError(f"bucket must be one of: {', '.join(BUCKETS)}")
+
+        today = timezone.localdate()
+        end = parse_date_param(request, "end") or today
+        start = parse_date_param(request, "start")
+        if start is None:
+            # The last `count` buckets up to and including the one holding `end`
+            start = self.bucket_start(end, bucket)
+            for _ in range(count - 1):
+                start = self.bucket_start(start - timedelta(days=1), bucket)
+        if start > end:
+            raise ValueError("start must be on or before end")
+
+        days = (end - self.bucket_start(start, bucket)).days
+        buckets = {"day": days + 1, "week": days // 7 + 1}.get(
+            bucket, (end.year - start.year) * 12 + end.month - start.month + 1
         )
-        
-        # Calculate total views for period
-        period_views = recent_articles.aggregate(total=Sum('view_count'))['total'] or 0
-        period_articles = recent_articles.count()
-        period_avg = period_views / period_articles if period_articles > 0 else 0
-        
-        # Generate chart data for each day
-        chart_data = []
-        
-        for i in range(7):
-            target_date = start_date.date() + timedelta(days=i)
-            day_label = target_date.strftime('%a')  # Mon, Tue, Wed, etc.
-            
-            # Get articles published on this specific day
-            daily_articles = queryset.filter(created_at__date=target_date)
-            daily_views = daily_articles.aggregate(total=Sum('view_count'))['total'] or 0
-            daily_count = daily_articles.count()
-            
-            chart_data.append({
-                "date": target_date.strftime('%Y-%m-%d'),
-                "day": day_label,
-                "label": day_label,
-                "views": daily_views,
-                "articles": daily_count,
-            })
-        
-        time_range_kpis = {
-            "total_views_in_period": period_views,
-            "avg_views_in_period": round(period_avg, 2),
-            "articles_published_in_period": period_articles,
-            "period_start": start_date,
-            "period_end": end_date,
-        }
-        
-        return chart_data, time_range_kpis
-    
-    def get_simple_weekly_data(self, queryset):
-        """Get simple weekly data for last 4 weeks"""
-        end_date = timezone.now()
-        start_date = end_date - timedelta(weeks=3)  # Last 4 weeks
-        
-        # Get articles published in the last 4 weeks
-        recent_articles = queryset.filter(
-            created_at__range=[start_date, end_date]
+        if buckets > MAX_BUCKETS:
+            raise ValueError(f"Range too long: at most {MAX_BUCKETS} {bucket} buckets")
+        return start, end, bucket
+
+    def bucket_start(self, day, bucket):
+        if bucket == "week":
+            return day - timedelta(days=day.weekday())
+        if bucket == "month":
+            return day.replace(day=1)
+        return day
+
+    def next_bucket(self, day, bucket):
+        if bucket == "week":
+            return day + timedelta(weeks=1)
+        if bucket == "month":
+            return day + timedelta(days=calendar.monthrange(day.year, day.month)[1])
+        return day + timedelta(days=1)
+
+    def get_chart_data(self, queryset, start, end, bucket):
+        """Views received and articles published per bucket between start and end."""
+        tz = timezone.get_current_timezone()
+        period_start = datetime.combine(start, time.min, tzinfo=tz)
+        period_end = datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz)
+
+        # Views come from the rollup table, so they are the views that
+        # happened in each bucket rather than lifetime views of new articles
+        views = views_by_bucket(start, end, BUCKETS[bucket], articles=queryset)
+
+        rows = (
+            queryset.filter(created_at__gte=period_start, created_at__lt=period_end)
+            .annotate(bucket=BUCKETS[bucket]("created_at"))
+            .values("bucket")
+            .annotate(articles=Count("id"))
+            .order_by()
         )
-        
-        # Calculate total views for period
-        period_views = recent_articles.aggregate(total=Sum('view_count'))['total'] or 0
-        period_articles = recent_articles.count()
-        period_avg = period_views / period_articles if period_articles > 0 else 0
-        
-        # Generate chart data for each week
+        articles = {timezone.localtime(row["bucket"], tz).date(): row["articles"] for row in rows}
+
+        # Fill empty buckets in Python
         chart_data = []
-        
-        for week_num in range(4):
-            week_start = start_date + timedelta(weeks=week_num)
-            week_end = week_start + timedelta(days=6)
-            
-            if week_end > end_date:
-                week_end = end_date
-            
-            # Get articles published in this week
-            weekly_articles = queryset.filter(
-                created_at__range=[week_start, week_end]
-            )
-            weekly_views = weekly_articles.aggregate(total=Sum('view_count'))['total'] or 0
-            weekly_count = weekly_articles.count()
-            
-            chart_data.append({
-                "week_number": week_num + 1,
-                "label": f"Week {week_num + 1}",
-                "start_date": week_start.date().strftime('%Y-%m-%d'),
-                "end_date": week_end.date().strftime('%Y-%m-%d'),
-                "views": weekly_views,
-                "articles": weekly_count,
-            })
-        
-        time_range_kpis = {
-            "total_views_in_period": period_views,
-            "avg_views_in_period": round(period_avg, 2),
-            "articles_published_in_period": period_articles,
-            "period_start": start_date,
-            "period_end": end_date,
-        }
-        
-        return chart_data, time_range_kpis
-    
-    def get_simple_monthly_data(self, queryset):
-        """Get simple monthly data for last 6 months"""
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=180)  # Last 6 months
-        
-        # Get articles published in the last 6 months
-        recent_articles = queryset.filter(
-            created_at__range=[start_date, end_date]
-        )
-        
-        # Calculate total views for period
-        period_views = recent_articles.aggregate(total=Sum('view_count'))['total'] or 0
-        period_articles = recent_articles.count()
+        day = self.bucket_start(start, bucket)
+        while day <= end:
+            chart_data.append(self.bucket_entry(
+                len(chart_data), day, bucket, end, views.get(day, 0), articles.get(day, 0)
+            ))
+            day = self.next_bucket(day, bucket)
+
+        period_views = sum(views.values())
+        period_articles = sum(articles.values())
         period_avg = period_views / period_articles if period_articles > 0 else 0
-        
-        # Generate chart data for each month
-        chart_data = []
-        current_date = start_date.replace(day=1)
-        
-        for i in range(6):
-            month_start = current_date
-            month_end = month_start + timedelta(days=calendar.monthrange(
-                month_start.year, month_start.month
-            )[1] - 1)
-            
-            if month_end > end_date:
-                month_end = end_date
-            
-            # Get articles published in this month
-            monthly_articles = queryset.filter(
-                created_at__range=[month_start, month_end]
-            )
-            monthly_views = monthly_articles.aggregate(total=Sum('view_count'))['total'] or 0
-            monthly_count = monthly_articles.count()
-            
-            month_label = month_start.strftime('%b')  # Jan, Feb, etc.
-            
-            chart_data.append({
-                "month": month_start.strftime('%Y-%m'),
-                "label": month_label,
-                "month_name": month_start.strftime('%B'),
-                "year": month_start.year,
-                "views": monthly_views,
-                "articles": monthly_count,
-            })
-            
-            # Move to next month
-            if month_start.month == 12:
-                current_date = month_start.replace(year=month_start.year + 1, month=1)
-            else:
-                current_date = month_start.replace(month=month_start.month + 1)
-        
         time_range_kpis = {
             "total_views_in_period": period_views,
             "avg_views_in_period": round(period_avg, 2),
             "articles_published_in_period": period_articles,
-            "period_start": start_date,
-            "period_end": end_date,
+            "period_start": period_start,
+            "period_end": period_end,
         }
         
         return chart_data, time_range_kpis
 
+    def bucket_entry(self, index, day, bucket, end, views, articles):
+        if bucket == "week":
+            return {
+                "week_number": index + 1,
+                "label": f"Week {index + 1}",
+                "start_date": day.strftime('%Y-%m-%d'),
+                "end_date": min(day + timedelta(days=6), end).strftime('%Y-%m-%d'),
+                "views": views,
+                "articles": articles,
+            }
+        if bucket == "month":
+            return {
+                "month": day.strftime('%Y-%m'),
+                "label": day.strftime('%b'),  # Jan, Feb, etc.
+                "month_name": day.strftime('%B'),
+                "year": day.year,
+                "views": views,
+                "articles": articles,
+            }
+        return {
+            "date": day.strftime('%Y-%m-%d'),
+            "day": day.strftime('%a'),  # Mon, Tue, Wed, etc.
+            "label": day.strftime('%a'),
+            "views": views,
+            "articles": articles,
+        }
 
-class TrendingArticlesAPIView(APIView):
+
+class TrendingArticlesAPIView(CachedResponseMixin, APIView):
     permission_classes = [permissions.AllowAny]
+    cache_tags = ("articles", "authors", "categories", "comments", "bookmarks")
 
-    def get(self, request):
-        try:
-            week_ago = timezone.now() - timedelta(days=7)
+    def get_articles(self, request, trending_ids):
+        trending_articles = Article.objects.for_listing().filter(
+            is_deleted=False,
+            is_published=True
+        )
+        trending_articles, serializer_class = select_article_representation(
+            request, trending_articles, default="compact"
+        )
 
-            trending_articles = Article.objects.filter(
-                created_at__gte=week_ago,
-                is_deleted=False,
-                is_published=True
-            ).order_by("-view_count")[:10]
+        # Precomputed decayed ranking (blog/trending.py)
+        if trending_ids:
+            return ranked(trending_articles, trending_ids)[:10], serializer_class
 
-            serializer = ArticleSerializer(trending_articles, many=True)
+        # Nothing scored yet: most viewed articles from the last week
+        week_ago = timezone.now() - timedelta(days=7)
+        trending_articles = trending_articles.filter(
+            created_at__gte=week_ago
+        ).order_by("-view_count")[:10]
+        return trending_articles, serializer_class
+
+    def get(self, request):
+        try:
+            trending_articles, serializer_class = self.get_articles(request, get_trending_ids())
+            serializer = serializer_class(trending_articles, many=True)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         except Exception as e:
@@ -254,12 +250,15 @@ class RecentActivityAPIView(APIView):
         try:
             last_48_hours = timezone.now() - timedelta(hours=48)
 
-            recent_articles = Article.objects.filter(
+            recent_articles = Article.objects.for_listing().filter(
                 created_at__gte=last_48_hours,
                 is_deleted=False
             ).order_by("-created_at")
+            recent_articles, serializer_class = select_article_representation(
+                request, recent_articles, default="compact"
+            )
 
-            serializer = ArticleSerializer(recent_articles, many=True)
+            serializer = serializer_class(recent_articles, many=True)
 
             return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -272,30 +271,100 @@ class RecentActivityAPIView(APIView):
 class AuthorPerformanceAPIView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
+    # ?sort= values (prefix with "-" for descending)
+    SORT_FIELDS = {
+        "id": "id",
+        "author_name": "user__fullname",
+        "total_articles": "total_articles",
+        "total_views": "total_views",
+        "avg_views": "avg_views",
+    }
+
     def get(self, request):
         try:
-            authors = Author.objects.all()
+            sort = request.GET.get("sort", "id")
+            if sort.lstrip("-") not in self.SORT_FIELDS:
+                return Response(
+                    {"error": f"sort must be one of: {', '.join(self.SORT_FIELDS)}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            try:
+                start = parse_date_param(request, "start")
+                end = parse_date_param(request, "end")
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-            data = []
+            # Optional ?start/?end limit the articles counted by created_at
+            article_lookups = {"is_deleted": False}
+            tz = timezone.get_current_timezone()
+            if start:
+                article_lookups["created_at__gte"] = datetime.combine(start, time.min, tzinfo=tz)
+            if end:
+                article_lookups["created_at__lt"] = datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz)
+            article_filter = Q(**{f"articles__{lookup}": value for lookup, value in article_lookups.items()})
 
-            for author in authors:
-                articles = author.articles.filter(is_deleted=False)
+            authors = Author.objects.select_related("user").annotate(
+                total_articles=Count("articles", filter=article_filter),
+                total_views=Coalesce(Sum("articles__view_count", filter=article_filter), 0),
+                avg_views=Coalesce(
+                    Avg("articles__view_count", filter=article_filter), 0.0, output_field=FloatField()
+                ),
+            )
+            prefix = "-" if sort.startswith("-") else ""
+            authors = authors.order_by(prefix + self.SORT_FIELDS[sort.lstrip("-")], "id")
 
-                total_articles = articles.count()
-                total_views = articles.aggregate(total=Sum("view_count"))["total"] or 0
-                avg_views = total_views / total_articles if total_articles else 0
+            # A plain list unless a page is requested
+            paginator = None
+            if "page" in request.GET or "page_size" in request.GET:
+                paginator = CustomPagination()
+                authors = paginator.paginate_queryset(authors, request, view=self)
 
-                data.append({
+            data = [
+                {
                     "author_id": author.id,
                     "author_name": author.user.fullname,
-                    "total_articles": total_articles,
-                    "total_views": total_views,
-                    "avg_views": round(avg_views, 2),
-                })
+                    "total_articles": author.total_articles,
+                    "total_views": author.total_views,
+                    "avg_views": round(author.avg_views, 2),
+                }
+                for author in authors
+            ]
 
+            if request.GET.get("breakdown") == "category":
+                breakdown = self.get_category_breakdown(
+                    [row["author_id"] for row in data], article_lookups
+                )
+                for row in data:
+                    row["categories"] = breakdown.get(row["author_id"], [])
+
+            if paginator:
+                return paginator.get_paginated_response(data)
             return Response(data, status=status.HTTP_200_OK)
 
         except Exception as e:
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+    def get_category_breakdown(self, author_ids, article_lookups):
+        """Per-category totals for the given authors, in one GROUP BY query."""
+        rows = (
+            Article.objects.filter(author_id__in=author_ids, **article_lookups)
+            .values("author_id", "category_id", "category__name")
+            .annotate(
+                total_articles=Count("id"),
+                total_views=Sum("view_count"),
+                avg_views=Avg("view_count"),
+            )
+            .order_by("author_id", "-total_views", "category_id")
+        )
+        breakdown = {}
+        for row in rows:
+            breakdown.setdefault(row["author_id"], []).append({
+                "category_id": row["category_id"],
+                "category_name": row["category__name"],
+                "total_articles": row["total_articles"],
+                "total_views": row["total_views"] or 0,
+                "avg_views": round(row["avg_views"] or 0, 2),
+            })
+        return breakdown
@@ -0,0 +1,51 @@
+"""
+Denormalized per-article counters.
+
+``Article.comment_count`` and ``Article.bookmark_count`` are adjusted with
+F() expressions by the Comment and Bookmark post_save / post_delete
+receivers, inside the transaction that writes the row, so listings read the
+counts without a join. ``reconcile_article_counters`` recomputes them.
+
+update() sends no Article signal, so the cached article responses, which
+show the counts, are invalidated through the counter's own cache tag.
+"""
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from core.utils.cache import invalidate_tags
+
+from .models import Article
+
+COUNTER_TAGS = {"comment_count": "comments", "bookmark_count": "bookmarks"}
+
+
+def adjust_counter(article_id, field, delta):
+    articles = Article.objects.filter(pk=article_id)
+    if delta < 0:
+        # Never below zero, even if the counter drifted
+        articles = articles.filter(**{f"{field}__gte": -delta})
+    # update() leaves updated_at alone: a new comment does not edit the article
+    if articles.update(**{field: F(field) + delta}):
+        # After commit, so no request re-caches the old count in between
+        transaction.on_commit(lambda: invalidate_tags(COUNTER_TAGS[field]))
+
+
+def actual_counts():
+    """{counter field: expression computing its true value for an Article row}."""
+    from bookmarks.models import Bookmark
+    from comments.models import Comment
+
+    def count(model):
+        return Coalesce(
+            Subquery(
+                model.objects.filter(article=OuterRef("pk"))
+                .order_by()
+                .values("article")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+
+    return {"comment_count": count(Comment), "bookmark_count": count(Bookmark)}
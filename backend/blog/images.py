@@ -0,0 +1,176 @@
+"""
+Responsive variants of article featured images.
+
+Uploads are stored as they come. Once the saving transaction commits, a
+thread pool decodes the image with Pillow and writes downscaled WebP (and
+AVIF, when Pillow supports it) copies at each configured width. The
+variants are then recorded on ``Article.image_variants`` as
+``{format: [[width, storage name], ...]}``, which ArticleSerializer turns
+into ``srcset`` strings. Encoding runs off the request thread, so an upload
+responds as soon as the original is saved. Until the variants exist, cards
+fall back to the original.
+
+Article images live in content-addressed storage (core/utils/storage.py),
+so articles sharing an upload share its file and variants too; see
+``release_image`` for when they are deleted.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, features
+
+from core.utils.cache import invalidate_tags
+
+from .models import Article, ImageUpload
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "WIDTHS": [320, 640, 1024, 1600],
+    "FORMATS": ["avif", "webp"],  # formats Pillow cannot encode are skipped
+    "QUALITY": {"avif": 60, "webp": 80},
+    "DIRECTORY": "articles_image_path/variants",
+    "MAX_WORKERS": 2,
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_setting(name):
+    return getattr(settings, "BLOG_IMAGE_VARIANTS", {}).get(name, DEFAULTS[name])
+
+
+def get_storage():
+    return Article._meta.get_field("featured_image").storage
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_setting("MAX_WORKERS"), thread_name_prefix="image-variants"
+            )
+        return _executor
+
+
+def encodable_formats():
+    return [name for name in get_setting("FORMATS") if features.check(name)]
+
+
+# -------------------------
+# ENCODING
+# -------------------------
+def _prepare(image):
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGB", "RGBA"):
+        return image
+    has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def build_variants(name):
+    """Write the variants of the stored image ``name`` and return them."""
+    storage = get_storage()
+    stem = os.path.splitext(os.path.basename(name))[0]
+    directory = get_setting("DIRECTORY")
+    quality = get_setting("QUALITY")
+    formats = encodable_formats()
+
+    variants = {fmt: [] for fmt in formats}
+    with storage.open(name) as file, Image.open(file) as original:
+        image = _prepare(original)
+        # Never upscale: widths past the original collapse into one variant at full size
+        widths = sorted({min(width, image.width) for width in get_setting("WIDTHS")})
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            for fmt in formats:
+                buffer = BytesIO()
+                resized.save(buffer, fmt.upper(), quality=quality.get(fmt, 80))
+                saved = storage.save(f"{directory}/{stem}-{width}w.{fmt}", ContentFile(buffer.getvalue()))
+                variants[fmt].append([width, saved])
+    return variants
+
+
+def variant_names(variants):
+    return [name for entries in (variants or {}).values() for _, name in entries]
+
+
+def release_image(name, variants=None):
+    """
+    Delete an image an article stopped using, and its variants, unless
+    an article or a chunked upload still references them. Call it once the
+    article row no longer points at them.
+    """
+    storage = get_storage()
+    users = Article.objects.filter(featured_image=name)
+    in_use = {
+        variant
+        for other in users.exclude(image_variants={}).values_list("image_variants", flat=True)
+        for variant in variant_names(other)
+    }
+    # Storage is content addressed, so an upload can hold the same file
+    uploaded = ImageUpload.objects.filter(image=name)
+    if name and not users.exists() and not uploaded.exists():
+        storage.delete(name)
+    for variant in variant_names(variants):
+        if variant not in in_use:
+            storage.delete(variant)
+
+
+def generate_variants(article_id, name, reuse=True):
+    """Build the variants of ``name`` and record them if it is still the article's image."""
+    try:
+        variants = None
+        if reuse:
+            # Another article with the same upload already has them
+            variants = (
+                Article.objects.filter(featured_image=name)
+                .exclude(pk=article_id)
+                .exclude(image_variants={})
+                .values_list("image_variants", flat=True)
+                .first()
+            )
+        variants = variants or build_variants(name)
+        # updated_at moves too, so cached 304s and ETags pick up the srcset
+        recorded = Article.objects.filter(pk=article_id, featured_image=name).update(
+            image_variants=variants, updated_at=timezone.now()
+        )
+        if recorded:
+            invalidate_tags("articles")
+        else:
+            # The image was replaced (or the article removed) meanwhile
+            release_image(name, variants)
+        return variants if recorded else None
+    except Exception:
+        logger.exception("Failed to build image variants of %s for article %s", name, article_id)
+        return None
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            connection.close()
+
+
+def schedule_variants(article):
+    """Build the variants of the article's current image once the transaction commits."""
+    if not article.featured_image:
+        return
+    article_id, name = article.pk, article.featured_image.name
+    transaction.on_commit(lambda: get_executor().submit(generate_variants, article_id, name))
+
+
+def srcset(variants, url):
+    """{format: "url 320w, url 640w, ..."} from recorded variants, ``url`` mapping names to URLs."""
+    return {
+        fmt: ", ".join(f"{url(name)} {width}w" for width, name in entries)
+        for fmt, entries in (variants or {}).items()
+        if entries
+    }
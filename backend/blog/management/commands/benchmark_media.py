@@ -0,0 +1,104 @@
+import io
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from django.views.static import serve as static_serve
+
+from core.utils.media import serve
+from core.utils.storage import content_digest, content_name
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the media view with the django.conf.urls.static helper: full "
+        "downloads, ETag revalidation and range requests"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="100,5000", help="Comma separated file sizes in KB")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",")]
+        factory = RequestFactory()
+
+        sink, client = socket.socketpair()
+        threading.Thread(target=self.drain, args=(client,), daemon=True).start()
+
+        with tempfile.TemporaryDirectory() as root, sink:
+            for size in sizes:
+                data = os.urandom(size * 1024)
+                name = content_name("articles_image_path/image.jpg", content_digest(io.BytesIO(data)))
+                os.makedirs(os.path.join(root, "articles_image_path"), exist_ok=True)
+                with open(os.path.join(root, name), "wb") as file:
+                    file.write(data)
+
+                etag = serve(factory.get("/"), name, document_root=root)["ETag"]
+                cases = [
+                    ("full GET", {}),
+                    ("revalidate", {"HTTP_IF_NONE_MATCH": etag}),
+                    ("64 KB range", {"HTTP_RANGE": "bytes=0-65535"}),
+                ]
+                self.stdout.write(self.style.MIGRATE_HEADING(f"{size} KB file"))
+                for label, headers in cases:
+                    def run_static():
+                        return static_serve(factory.get("/", **headers), name, document_root=root)
+
+                    def run_media():
+                        return serve(factory.get("/", **headers), name, document_root=root)
+
+                    self.report(label, "static()", run_static, sink, options["repeat"])
+                    self.report(label, "media", run_media, sink, options["repeat"])
+
+                with override_settings(MEDIA_SERVING={"BACKEND": "x-accel-redirect"}):
+                    self.report(
+                        "full GET", "x-accel",
+                        lambda: serve(factory.get("/"), name, document_root=root),
+                        sink, options["repeat"],
+                    )
+
+    def drain(self, client):
+        """Read everything sent, like a client would."""
+        with client:
+            while client.recv(1024 * 1024):
+                pass
+
+    def deliver(self, response, sink):
+        """
+        Send the body over a socket the way a WSGI server with a sendfile
+        wsgi.file_wrapper (gunicorn) does: from the file's current offset,
+        Content-Length bytes. Returns (bytes copied by Python, by the kernel).
+        """
+        try:
+            file = getattr(response, "file_to_stream", None)
+            if file is not None and hasattr(file, "fileno"):
+                offset = os.lseek(file.fileno(), 0, os.SEEK_CUR)
+                end = offset + int(response["Content-Length"])
+                while offset < end:
+                    offset += os.sendfile(sink.fileno(), file.fileno(), offset, end - offset)
+                return 0, int(response["Content-Length"])
+            copied = 0
+            for chunk in response:
+                sink.sendall(chunk)
+                copied += len(chunk)
+            return copied, 0
+        finally:
+            response.close()
+
+    def report(self, label, variant, view, sink, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = view()
+            python_bytes, kernel_bytes = self.deliver(response, sink)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        self.stdout.write(
+            f"  {label:<12} {variant:<9} {response.status_code}  {best * 1000:7.3f} ms  "
+            f"python {python_bytes / 1024:8.0f} KB  sendfile {kernel_bytes / 1024:8.0f} KB"
+        )
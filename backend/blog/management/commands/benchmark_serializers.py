@@ -0,0 +1,95 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from blog.models import Article
+from blog.serializers import FAST_SERIALIZERS
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare DRF and fast-path article serialization throughput and output"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", default="10,100,1000",
+            help="Comma separated result sizes to benchmark",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",")]
+        try:
+            # Any seeded rows are thrown away with the transaction
+            with transaction.atomic():
+                self.seed(max(sizes))
+                self.run(sizes, options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, count):
+        missing = count - Article.objects.count()
+        template = Article.objects.filter(author__isnull=False).first()
+        if missing <= 0:
+            return
+        if template is None:
+            raise CommandError("Need at least one article with an author to seed from")
+
+        Article.objects.bulk_create(
+            Article(
+                title=f"Benchmark article {index}",
+                slug=f"benchmark-article-{index}",
+                content=template.content,
+                excerpt=template.excerpt,
+                featured_image=template.featured_image,
+                author=template.author,
+                # Leave some rows uncategorized to cover null relations
+                category=template.category if index % 3 else None,
+                is_published=True,
+            )
+            for index in range(missing)
+        )
+        self.stdout.write(f"Seeded {missing} temporary articles")
+
+    def run(self, sizes, repeat):
+        renderer = JSONRenderer()
+
+        for serializer_class, fast_class in FAST_SERIALIZERS.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(serializer_class.__name__))
+            for size in sizes:
+                queryset = Article.objects.for_listing().order_by("-created_at", "-id")
+                if "content" not in serializer_class.Meta.fields:
+                    queryset = queryset.compact()
+
+                def drf():
+                    return serializer_class(list(queryset[:size]), many=True).data
+
+                def fast():
+                    return fast_class(fast_class.values(queryset)[:size]).data
+
+                drf_bytes = renderer.render(drf())
+                fast_bytes = renderer.render(fast())
+                if drf_bytes != fast_bytes:
+                    raise CommandError(f"{fast_class.__name__} output differs at {size} rows")
+
+                drf_time = self.measure(drf, repeat)
+                fast_time = self.measure(fast, repeat)
+                self.stdout.write(
+                    f"  {size:>6} rows  drf {drf_time * 1000:8.2f} ms  "
+                    f"fast {fast_time * 1000:8.2f} ms  x{drf_time / fast_time:.1f}"
+                )
+
+    def measure(self, func, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
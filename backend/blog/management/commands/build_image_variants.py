@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from blog.images import encodable_formats, generate_variants, get_setting, release_image
+from blog.models import Article
+
+
+class Command(BaseCommand):
+    help = "Build the resized featured image variants of articles that do not have them yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all", action="store_true",
+            help="Rebuild the variants of every article with an image",
+        )
+        parser.add_argument("--workers", type=int, default=get_setting("MAX_WORKERS"))
+
+    def handle(self, *args, **options):
+        articles = Article.objects.exclude(Q(featured_image="") | Q(featured_image__isnull=True))
+        if not options["all"]:
+            articles = articles.filter(image_variants={})
+        articles = list(articles.values_list("pk", "featured_image", "image_variants"))
+
+        self.stdout.write(f"Encoding {', '.join(encodable_formats())} variants of {len(articles)} images")
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            results = list(executor.map(lambda row: self.build(row, rebuild=options["all"]), articles))
+
+        failed = results.count(None)
+        self.stdout.write(self.style.SUCCESS(f"Built variants for {len(results) - failed} articles"))
+        if failed:
+            self.stdout.write(self.style.WARNING(f"{failed} images could not be processed (see the log)"))
+
+    def build(self, row, rebuild):
+        article_id, name, old_variants = row
+        variants = generate_variants(article_id, name, reuse=not rebuild)
+        # Old copies go only once the new ones are recorded (and no article uses them)
+        if variants is not None:
+            release_image(name, old_variants)
+        return variants
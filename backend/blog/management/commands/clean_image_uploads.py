@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.uploads import clean_uploads, get_setting
+
+
+class Command(BaseCommand):
+    help = "Delete chunked image uploads that no article took within EXPIRY_HOURS"
+
+    def handle(self, *args, **options):
+        count = clean_uploads()
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {count} uploads older than {get_setting('EXPIRY_HOURS')} hours"
+        ))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.rollups import compact_rollups
+
+
+class Command(BaseCommand):
+    help = "Fold old daily article view rollups into weeks, and old weeks into months"
+
+    def handle(self, *args, **options):
+        weeks, months = compact_rollups()
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {weeks} week rollups and {months} month rollups")
+        )
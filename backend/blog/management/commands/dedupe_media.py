@@ -0,0 +1,82 @@
+import os
+import shutil
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.images import variant_names
+from blog.models import Article
+from core.utils.cache import invalidate_tags
+from core.utils.storage import content_digest, content_name
+
+
+class Command(BaseCommand):
+    help = (
+        "Rename the article image directory to content-addressed names in place, "
+        "keeping one file per distinct content and pointing articles at it"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+
+    def handle(self, *args, **options):
+        field = Article._meta.get_field("featured_image")
+        storage = field.storage
+        root = storage.path("")
+
+        renames = {}
+        freed = 0
+        kept = set()
+        for directory, _, files in os.walk(storage.path(field.upload_to)):
+            for filename in sorted(files):
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, root).replace(os.sep, "/")
+                with open(path, "rb") as file:
+                    target = content_name(name, content_digest(file))
+                if target == name:
+                    kept.add(target)
+                    continue
+                renames[name] = target
+                if target in kept or os.path.exists(storage.path(target)):
+                    freed += os.path.getsize(path)
+                kept.add(target)
+
+        self.stdout.write(
+            f"{len(renames)} files to rename into {len(kept)} distinct files, "
+            f"{freed / 1024 / 1024:.1f} MB of duplicates"
+        )
+        if options["dry_run"] or not renames:
+            return
+
+        # Every target exists before any article points at it
+        for name, target in renames.items():
+            target_path = storage.path(target)
+            if not os.path.exists(target_path):
+                try:
+                    os.link(storage.path(name), target_path)
+                except OSError:
+                    shutil.copyfile(storage.path(name), target_path)
+
+        with transaction.atomic():
+            updated = 0
+            for name, target in renames.items():
+                updated += Article.objects.filter(featured_image=name).update(featured_image=target)
+
+            for pk, variants in Article.objects.exclude(image_variants={}).values_list("pk", "image_variants"):
+                if not any(name in renames for name in variant_names(variants)):
+                    continue
+                remapped = {
+                    fmt: [[width, renames.get(name, name)] for width, name in entries]
+                    for fmt, entries in variants.items()
+                }
+                Article.objects.filter(pk=pk).update(image_variants=remapped)
+                updated += 1
+
+        # Old names are no longer referenced once the transaction commits
+        for name in renames:
+            os.remove(storage.path(name))
+        invalidate_tags("articles")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Renamed {len(renames)} files, freed {freed / 1024 / 1024:.1f} MB, updated {updated} article rows"
+        ))
@@ -0,0 +1,251 @@
+import random
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.utils import timezone
+
+from authors.models import Author
+from blog.analytics_views import TrendingArticlesAPIView
+from blog.models import Article
+from blog.search import get_search_backend
+from blog.search.backends import PostgresSearchBackend
+from blog.serializers import get_fast_serializer
+from blog.views import (
+    ArticleListView, ArticlesByAuthorView, ArticleSearchView, LatestArticlesView, MyArticlesView,
+)
+from bookmarks.models import Bookmark
+from bookmarks.views import BookmarkListCreateView
+from category.models import Category
+from category.views import ArticlesByCategoryAPIView, ArticlesByCategorySlugAPIView
+from comments.models import Comment
+from comments.tree import comments_of, replies_of, top_level_comments
+from core.utils.pagination import KeysetPagination
+from users.models import User
+
+SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+# Seeded into one article in 200, so a search matches a small share of them
+SEARCH_TERM = "indexing"
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the article, comment and bookmark queries of the API views against "
+        "a seeded dataset and fail if any of them scans one of those tables sequentially"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=20000)
+        parser.add_argument("--authors", type=int, default=200)
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--comments", type=int, default=50000)
+        parser.add_argument("--bookmarks", type=int, default=20000)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("explain_queries reads PostgreSQL plans")
+
+        failures = []
+        try:
+            # The seeded rows (and their statistics) go away with the transaction
+            with transaction.atomic():
+                self.seed(options)
+                tables = [
+                    connection.ops.quote_name(model._meta.db_table)
+                    for model in (Article, Comment, Bookmark, Author, Category, User)
+                ]
+                with connection.cursor() as cursor:
+                    cursor.execute(f"ANALYZE {', '.join(tables)}")
+
+                for label, queryset in self.queries():
+                    plan = queryset.explain()
+                    scanned = set(SEQ_SCAN.findall(plan)) & self.checked_tables()
+                    if scanned:
+                        failures.append(label)
+                        self.stdout.write(self.style.ERROR(f"SEQ SCAN  {label} ({', '.join(sorted(scanned))})"))
+                        self.stdout.write(plan)
+                    else:
+                        self.stdout.write(self.style.SUCCESS(f"OK        {label}"))
+                        if options["verbosity"] > 1:
+                            self.stdout.write(plan)
+                raise Rollback
+        except Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f"{len(failures)} queries scan a whole table: {', '.join(failures)}")
+
+    def checked_tables(self):
+        return {model._meta.db_table for model in (Article, Comment, Bookmark)}
+
+    # -------------------------
+    # DATASET
+    # -------------------------
+    def seed(self, options):
+        rnd = random.Random(0)
+
+        users = User.objects.bulk_create(
+            User(email=f"explain-{index}@example.com", fullname=f"Explain {index}", is_author=True, password="!")
+            for index in range(options["authors"])
+        )
+        authors = Author.objects.bulk_create(Author(user=user) for user in users)
+        categories = Category.objects.bulk_create(
+            Category(name=f"Explain category {index}", slug=f"explain-category-{index}")
+            for index in range(options["categories"])
+        )
+
+        articles = Article.objects.bulk_create(
+            Article(
+                title=f"Explain article {index}",
+                slug=f"explain-article-{index}",
+                content=SEARCH_TERM if index % 200 == 0 else "",
+                author=rnd.choice(authors),
+                category=rnd.choice(categories) if index % 10 else None,
+                view_count=rnd.randrange(10000),
+                is_published=rnd.random() < 0.9,
+                is_deleted=rnd.random() < 0.05,
+            )
+            for index in range(options["articles"])
+        )
+        # created_at is auto_now_add: spread the rows over two years afterwards
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {connection.ops.quote_name(Article._meta.db_table)} "
+                f"SET created_at = NOW() - (id %% 730) * INTERVAL '1 day' - (id %% 1440) * INTERVAL '1 minute' "
+                f"WHERE slug LIKE %s",
+                ["explain-article-%"],
+            )
+
+        # The tsvector lives in the rows, so it goes away with them too
+        if isinstance(get_search_backend(), PostgresSearchBackend):
+            get_search_backend().index([article.pk for article in articles])
+
+        now = timezone.now()
+        top_level = options["comments"] * 2 // 3
+        threads = Comment.objects.bulk_create(
+            Comment(
+                article=rnd.choice(articles),
+                user=rnd.choice(users),
+                content="",
+                created_at=now - timedelta(minutes=rnd.randrange(525600)),
+            )
+            for _ in range(top_level)
+        )
+        Comment.objects.bulk_create(
+            Comment(
+                article_id=parent.article_id,
+                parent=parent,
+                user=rnd.choice(users),
+                content="",
+                created_at=parent.created_at + timedelta(minutes=rnd.randrange(1, 600)),
+            )
+            for parent in (rnd.choice(threads) for _ in range(options["comments"] - top_level))
+        )
+
+        # Distinct (user, article) pairs for the unique constraint
+        pairs = rnd.sample(range(len(users) * len(articles)), min(options["bookmarks"], len(users) * len(articles)))
+        Bookmark.objects.bulk_create(
+            Bookmark(user=users[pair // len(articles)], article=articles[pair % len(articles)])
+            for pair in pairs
+        )
+
+        self.stdout.write(
+            f"Seeded {len(articles)} articles, {options['comments']} comments and "
+            f"{len(pairs)} bookmarks for {len(authors)} authors"
+        )
+        self.sample = {
+            "author": authors[0],
+            "category": categories[0],
+            "article": Comment.objects.filter(parent__isnull=True).values_list("article", flat=True).first(),
+            "comment": threads[0],
+            "user": users[0],
+            "trending": [article.pk for article in articles[:50]],
+        }
+
+    # -------------------------
+    # QUERIES
+    # -------------------------
+    def queries(self):
+        """
+        (label, queryset) for the queries the list and detail views run, built
+        by the views' own get_articles() and the same pagination, so the check
+        follows any change to them.
+        """
+        sample = self.sample
+        request = RequestFactory().get("/")
+        checks = []
+
+        # Offset pages order by the sort's first column, cursor pages by both
+        view = ArticleListView()
+        for sort, ordering in view.orderings.items():
+            articles, serializer_class = view.get_articles(request)
+            checks.append((f"article list, {sort}", self.offset_page(articles.order_by(ordering[0]), serializer_class)))
+            checks += self.keyset_pages(f"article list, {sort}", articles, ordering)
+
+        articles, serializer_class = LatestArticlesView().get_articles(request)
+        checks.append(("latest articles", self.offset_page(articles, serializer_class)))
+
+        view = ArticleSearchView()
+        checks.append(("search", view.get_articles(request, SEARCH_TERM)[0][:10]))
+        checks += self.keyset_pages(
+            "search", view.get_articles(request, SEARCH_TERM, ranked=False)[0], view.cursor_ordering
+        )
+
+        view = TrendingArticlesAPIView()
+        checks.append(("trending", view.get_articles(request, sample["trending"])[0]))
+        checks.append(("trending fallback", view.get_articles(request, [])[0]))
+
+        checks.append(("my articles", MyArticlesView().get_articles(request, sample["author"])[0]))
+        checks.append(("author's published articles", ArticlesByAuthorView().get_articles(request, sample["author"])[0]))
+
+        category = sample["category"]
+        view = ArticlesByCategoryAPIView()
+        checks.append(("category articles, validators", view.get_conditional_queryset(request, category.pk)))
+        articles = view.get_articles(request, category.pk)[0]
+        checks.append(("category articles", articles[:10]))
+        checks += self.keyset_pages("category articles", articles, view.cursor_ordering)
+
+        view = ArticlesByCategorySlugAPIView()
+        checks.append(("category slug articles, validators", view.get_conditional_queryset(request, category.slug)))
+        articles = view.get_articles(request, category)[0]
+        checks.append(("category slug articles", articles[:10]))
+        checks += self.keyset_pages("category slug articles", articles, view.cursor_ordering)
+
+        threads = top_level_comments(sample["article"])[:10]
+        checks += [
+            ("comment tree", comments_of(sample["article"])),
+            ("comment threads page", threads),
+            ("comment replies", replies_of([comment.id for comment in threads])),
+            ("bookmarks", BookmarkListCreateView().get_bookmarks(sample["user"])),
+        ]
+        return checks
+
+    def offset_page(self, articles, serializer_class, page_size=10):
+        """A first offset page, built from values() rows where the view does that too."""
+        fast_serializer_class = get_fast_serializer(serializer_class)
+        if fast_serializer_class:
+            articles = fast_serializer_class.values(articles)
+        return articles[:page_size]
+
+    def keyset_pages(self, label, queryset, ordering, page_size=10):
+        """The first page and the pages either side of its last row, as KeysetPagination fetches them."""
+        paginator = KeysetPagination(ordering)
+        first_page = paginator.get_page_queryset(queryset)
+        checks = [(f"{label}, first cursor page", first_page[: page_size + 1])]
+        page = list(first_page[:page_size])
+        if page:
+            position = [getattr(page[-1], name.lstrip("-")) for name in ordering]
+            checks += [
+                (f"{label}, next cursor page", paginator.get_page_queryset(queryset, position)[: page_size + 1]),
+                (
+                    f"{label}, previous cursor page",
+                    paginator.get_page_queryset(queryset, position, reverse=True)[: page_size + 1],
+                ),
+            ]
+        return checks
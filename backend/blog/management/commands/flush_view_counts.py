@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.view_counter import get_setting, get_view_buffer
+
+
+class Command(BaseCommand):
+    help = "Write the views pending in a shared view buffer (RedisViewBuffer) to the database"
+
+    def handle(self, *args, **options):
+        view_buffer = get_view_buffer()
+        if not view_buffer.shared:
+            # This process's own buffer is empty; the workers' are out of reach
+            raise CommandError(
+                f"{get_setting('BACKEND')} keeps pending views inside each worker process, "
+                "which flush them on their own; set REDIS_URL to use the shared RedisViewBuffer"
+            )
+        counts = view_buffer.flush()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Flushed {sum(counts.values())} views for {len(counts)} articles"
+            )
+        )
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from blog.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the article search index for the configured search backend"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backend",
+            help="Dotted path of a search backend to rebuild instead of the configured one",
+        )
+
+    def handle(self, *args, **options):
+        if options["backend"]:
+            backend = import_string(options["backend"])()
+        else:
+            backend = get_search_backend()
+
+        count = backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {count} articles with {backend.__class__.__name__}")
+        )
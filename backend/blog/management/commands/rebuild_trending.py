@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.trending import rebuild_scores
+
+
+class Command(BaseCommand):
+    help = "Recompute trending scores from stored views, comments, likes and bookmarks"
+
+    def handle(self, *args, **options):
+        count = rebuild_scores()
+        self.stdout.write(self.style.SUCCESS(f"Scored {count} articles"))
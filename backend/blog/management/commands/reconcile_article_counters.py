@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from blog.counters import COUNTER_TAGS, actual_counts
+from blog.models import Article
+from core.utils.cache import invalidate_tags
+
+
+class Command(BaseCommand):
+    help = "Recompute Article.comment_count and Article.bookmark_count from their tables"
+
+    def handle(self, *args, **options):
+        actual = actual_counts()
+        drifted = Q()
+        for field in actual:
+            drifted |= ~Q(**{field: F(f"actual_{field}")})
+
+        # Only touch rows that drifted (e.g. rows removed by bulk deletes)
+        fixed = (
+            Article.objects.annotate(**{f"actual_{field}": value for field, value in actual.items()})
+            .filter(drifted)
+            .update(**actual)
+        )
+        if fixed:
+            invalidate_tags(*COUNTER_TAGS.values())
+        self.stdout.write(self.style.SUCCESS(f"Fixed counters on {fixed} articles"))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver
+
+from core.utils.cache import get_cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Show response cache hits and misses per view. Counters live in the "
+        "configured cache, so a per-process cache only reports its own process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after printing")
+
+    def handle(self, *args, **options):
+        # Importing the URLconf registers every cached view
+        get_resolver().url_patterns
+
+        for name, counts in get_cache_stats().items():
+            total = counts["hits"] + counts["misses"]
+            ratio = counts["hits"] / total * 100 if total else 0
+            self.stdout.write(
+                f"{name:<32} hits {counts['hits']:>8}  misses {counts['misses']:>8}  hit rate {ratio:5.1f}%"
+            )
+
+        if options["reset"]:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset"))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:22
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def populate_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Article = apps.get_model("blog", "Article")
+    Article.objects.update(
+        search_vector=SearchVector("title", weight="A", config="english")
+        + SearchVector("excerpt", weight="B", config="english")
+        + SearchVector("content", weight="C", config="english")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authors', '0002_rename_joined_at_author_created_at_and_more'),
+        ('blog', '0005_alter_article_featured_image'),
+        ('category', '0002_remove_category_color_remove_category_description_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='article_search_vector_idx'),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_article_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleViewRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], default='day', max_length=5)),
+                ('period_start', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_rollups', to='blog.article')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', 'period_start'], name='view_rollup_period_idx')],
+                'constraints': [models.UniqueConstraint(fields=('article', 'period', 'period_start'), name='unique_article_view_rollup')],
+            },
+        ),
+    ]
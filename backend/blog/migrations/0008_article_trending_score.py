@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_article_view_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleTrendingScore',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending_score', serialize=False, to='blog.article')),
+                ('score', models.FloatField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:39
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    Article = apps.get_model("blog", "Article")
+    Comment = apps.get_model("comments", "Comment")
+    Bookmark = apps.get_model("bookmarks", "Bookmark")
+
+    def count(model):
+        return Coalesce(
+            Subquery(
+                model.objects.filter(article=OuterRef("pk"))
+                .order_by()
+                .values("article")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+
+    Article.objects.update(comment_count=count(Comment), bookmark_count=count(Bookmark))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_article_trending_score'),
+        ('bookmarks', '0001_initial'),
+        ('comments', '0002_comment_likes_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='bookmark_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
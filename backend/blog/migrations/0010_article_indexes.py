@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authors', '0002_rename_joined_at_author_created_at_and_more'),
+        ('blog', '0009_article_counters'),
+        ('category', '0002_remove_category_color_remove_category_description_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_deleted', False), ('is_published', True)), fields=['-created_at', '-id'], name='article_live_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-created_at', '-id'], name='article_active_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['view_count', 'id'], name='article_active_views_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['author', 'is_deleted', '-created_at'], name='article_author_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_deleted', False), ('is_published', True)), fields=['category', '-created_at'], name='article_category_live_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:46
+
+import core.utils.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_article_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='article',
+            name='featured_image',
+            field=models.ImageField(blank=True, max_length=500, null=True, storage=core.utils.storage.article_image_storage, upload_to='articles_image_path'),
+        ),
+    ]
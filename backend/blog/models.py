@@ -1,7 +1,23 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from authors.models import Author
 from django.utils.text import slugify
 from category.models import Category
+from core.utils.storage import article_image_storage
+
+
+class ArticleQuerySet(models.QuerySet):
+    def for_listing(self):
+        """Join the author's user and the category, which ArticleSerializer reads per row."""
+        return self.select_related("author__user", "category").defer("search_vector")
+
+    def compact(self):
+        """Skip the article body for listings that do not render it."""
+        return self.defer("content")
 
 
 class Article(models.Model):
@@ -10,8 +26,11 @@ class Article(models.Model):
     content = models.TextField()
     excerpt = models.TextField(blank=True, null=True)
     featured_image = models.ImageField(
-        upload_to="articles_image_path", blank=True, null=True, max_length=500
+        upload_to="articles_image_path", blank=True, null=True, max_length=500,
+        storage=article_image_storage,
     )
+    # Resized WebP/AVIF copies of featured_image, written by blog.images
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     author = models.ForeignKey(
         Author, on_delete=models.CASCADE, related_name="articles"
     )
@@ -27,11 +46,50 @@ class Article(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     view_count = models.PositiveIntegerField(default=0)
+    # Maintained by the comment and bookmark signals, see blog.counters
+    comment_count = models.PositiveIntegerField(default=0)
+    bookmark_count = models.PositiveIntegerField(default=0)
     is_published = models.BooleanField(default=False)
     is_deleted = models.BooleanField(default=False)
 
+    # Weighted title/excerpt/content, maintained by blog.search on save
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = ArticleQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="article_search_vector_idx"),
+            # Public listings: latest, trending, search
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="article_live_recent_idx",
+                condition=models.Q(is_published=True, is_deleted=False),
+            ),
+            # Article list (date and view sorts, offset and cursor pages)
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="article_active_recent_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["view_count", "id"],
+                name="article_active_views_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            # An author's articles, and their drafts
+            models.Index(
+                fields=["author", "is_deleted", "-created_at"],
+                name="article_author_recent_idx",
+            ),
+            # Category pages
+            models.Index(
+                fields=["category", "-created_at"],
+                name="article_category_live_idx",
+                condition=models.Q(is_published=True, is_deleted=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.author}"
@@ -40,3 +98,76 @@ class Article(models.Model):
         if not self.slug:
             self.slug = slugify(self.title)
         super().save(*args, **kwargs)
+
+
+class ArticleViewRollup(models.Model):
+    """Views an article received during one day, week or month (see blog/rollups.py)."""
+
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    PERIOD_CHOICES = [(DAY, "Day"), (WEEK, "Week"), (MONTH, "Month")]
+
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name="view_rollups"
+    )
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES, default=DAY)
+    period_start = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["article", "period", "period_start"],
+                name="unique_article_view_rollup",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["period", "period_start"], name="view_rollup_period_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.article_id} {self.period} {self.period_start}: {self.views}"
+
+
+class ArticleTrendingScore(models.Model):
+    """
+    Exponentially decayed engagement score of an article (see blog/trending.py),
+    stored as a natural log relative to a fixed epoch so it never needs rescaling.
+    """
+
+    article = models.OneToOneField(
+        Article, on_delete=models.CASCADE, primary_key=True, related_name="trending_score"
+    )
+    score = models.FloatField(db_index=True)
+
+    def __str__(self):
+        return f"{self.article_id}: {self.score}"
+
+
+class ImageUpload(models.Model):
+    """A featured image uploaded in chunks (see blog/uploads.py), until an article takes it."""
+
+    PENDING = "pending"
+    COMPLETE = "complete"
+    STATUS_CHOICES = [(PENDING, "Pending"), (COMPLETE, "Complete")]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="image_uploads"
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=8, choices=STATUS_CHOICES, default=PENDING)
+    # Known once the header has arrived
+    image_format = models.CharField(max_length=10, blank=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    # Storage name of the finished image
+    image = models.CharField(max_length=500, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
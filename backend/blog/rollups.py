@@ -0,0 +1,128 @@
+"""
+Per-period article view rollups.
+
+Every view-counter flush adds its views to the (article, day) row for
+today, so analytics can ask how many views happened in a period instead of
+attributing lifetime view counts to the day an article was created. Old day
+rows are compacted into week rows, and old week rows into month rows, to
+keep the table small.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import Article, ArticleViewRollup
+
+DEFAULTS = {
+    "DAY_RETENTION": 90,  # days kept at day granularity
+    "WEEK_RETENTION": 365,  # days kept at week granularity
+    "BATCH_SIZE": 500,
+}
+
+
+def get_setting(name):
+    return getattr(settings, "BLOG_VIEW_ROLLUPS", {}).get(name, DEFAULTS[name])
+
+
+def add_rollup_views(rows):
+    """Add views to rollup rows given as (article_id, period, period_start, views)."""
+    rows = [row for row in rows if row[3]]
+    batch_size = get_setting("BATCH_SIZE")
+    table = connection.ops.quote_name(ArticleViewRollup._meta.db_table)
+    article_table = connection.ops.quote_name(Article._meta.db_table)
+
+    with transaction.atomic():
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+
+            if connection.vendor == "postgresql":
+                # Joining on the article table drops views of deleted articles
+                values = ", ".join(["(%s, %s, %s::date, %s)"] * len(batch))
+                params = [value for row in batch for value in row]
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"INSERT INTO {table} (article_id, period, period_start, views) "
+                        f"SELECT v.article_id, v.period, v.period_start, v.views "
+                        f"FROM (VALUES {values}) AS v(article_id, period, period_start, views) "
+                        f"JOIN {article_table} a ON a.id = v.article_id "
+                        f"ON CONFLICT (article_id, period, period_start) "
+                        f"DO UPDATE SET views = {table}.views + EXCLUDED.views",
+                        params,
+                    )
+            else:
+                existing = set(
+                    Article.objects.filter(pk__in={row[0] for row in batch}).values_list("pk", flat=True)
+                )
+                for article_id, period, period_start, views in batch:
+                    if article_id not in existing:
+                        continue
+                    updated = ArticleViewRollup.objects.filter(
+                        article_id=article_id, period=period, period_start=period_start
+                    ).update(views=F("views") + views)
+                    if not updated:
+                        ArticleViewRollup.objects.create(
+                            article_id=article_id, period=period,
+                            period_start=period_start, views=views,
+                        )
+
+
+def record_daily_views(counts, day=None):
+    """Add flushed view counts ({article_id: views}) to the rows for ``day`` (today)."""
+    day = day or timezone.localdate()
+    add_rollup_views(
+        (article_id, ArticleViewRollup.DAY, day, views) for article_id, views in counts.items()
+    )
+
+
+def _compact(period, target, trunc, cutoff):
+    rollups = ArticleViewRollup.objects.filter(period=period, period_start__lt=cutoff)
+    rows = (
+        rollups.annotate(target_start=trunc("period_start"))
+        .values("article_id", "target_start")
+        .annotate(total=Sum("views"))
+        .order_by()
+    )
+    rows = [(row["article_id"], target, row["target_start"], row["total"]) for row in rows]
+    add_rollup_views(rows)
+    rollups.delete()
+    return len(rows)
+
+
+def compact_rollups(today=None):
+    """
+    Fold complete weeks of day rows older than DAY_RETENTION into week rows,
+    then complete months of week rows older than WEEK_RETENTION into month
+    rows. Week rows count towards the month their week starts in.
+    """
+    today = today or timezone.localdate()
+
+    day_cutoff = today - timedelta(days=get_setting("DAY_RETENTION"))
+    day_cutoff -= timedelta(days=day_cutoff.weekday())
+    week_cutoff = (today - timedelta(days=get_setting("WEEK_RETENTION"))).replace(day=1)
+
+    with transaction.atomic():
+        weeks = _compact(ArticleViewRollup.DAY, ArticleViewRollup.WEEK, TruncWeek, day_cutoff)
+        months = _compact(ArticleViewRollup.WEEK, ArticleViewRollup.MONTH, TruncMonth, week_cutoff)
+    return weeks, months
+
+
+def views_by_bucket(start, end, trunc, articles=None):
+    """
+    Return {bucket start date: views} between two dates (inclusive). Rows
+    already compacted to a coarser period count towards the bucket their
+    period starts in.
+    """
+    rollups = ArticleViewRollup.objects.filter(period_start__gte=start, period_start__lte=end)
+    if articles is not None:
+        rollups = rollups.filter(article__in=articles)
+    rows = (
+        rollups.annotate(bucket=trunc("period_start"))
+        .values("bucket")
+        .annotate(views=Sum("views"))
+        .order_by()
+    )
+    return {row["bucket"]: row["views"] for row in rows}
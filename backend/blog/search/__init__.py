@@ -0,0 +1,25 @@
+"""
+Article search.
+
+The backend is chosen by the BLOG_SEARCH_BACKEND setting (a dotted path);
+when unset, Postgres databases use the tsvector backend and anything else
+falls back to plain ``icontains`` matching.
+"""
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+_backend = None
+
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        path = getattr(settings, "BLOG_SEARCH_BACKEND", None)
+        if path is None:
+            if connection.vendor == "postgresql":
+                path = "blog.search.backends.PostgresSearchBackend"
+            else:
+                path = "blog.search.backends.DatabaseSearchBackend"
+        _backend = import_string(path)()
+    return _backend
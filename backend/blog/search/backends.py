@@ -0,0 +1,157 @@
+import os
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import Case, F, IntegerField, Q, When
+
+from authors.models import Author
+from blog.models import Article
+from category.models import Category
+
+from .index import InvertedIndex
+
+
+class BaseSearchBackend:
+    """
+    Search backends filter an Article queryset by a user query and keep
+    whatever index they rely on up to date when articles change.
+    """
+
+    def search(self, queryset, query, ranked=True):
+        """Return ``queryset`` narrowed to ``query``, best matches first when ``ranked``."""
+        raise NotImplementedError
+
+    def index(self, article_ids):
+        """(Re)index the given articles after they were saved."""
+
+    def remove(self, article_ids):
+        """Drop the given articles from the index after they were deleted."""
+
+    def rebuild(self):
+        """Rebuild the whole index; returns the number of articles indexed."""
+        return 0
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """Unindexed ``icontains`` matching, for databases without full-text search."""
+
+    def search(self, queryset, query, ranked=True):
+        return queryset.filter(
+            Q(title__icontains=query)
+            | Q(excerpt__icontains=query)
+            | Q(content__icontains=query)
+            | Q(category__name__icontains=query)
+            | Q(author__user__fullname__icontains=query)
+        ).order_by("-created_at")
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Matches against Article.search_vector (GIN indexed), weighting title
+    over excerpt over content, and ranks results with ts_rank.
+    """
+
+    config = "english"
+
+    def get_vector(self):
+        return (
+            SearchVector("title", weight="A", config=self.config)
+            + SearchVector("excerpt", weight="B", config=self.config)
+            + SearchVector("content", weight="C", config=self.config)
+        )
+
+    def search(self, queryset, query, ranked=True):
+        search_query = SearchQuery(query, search_type="websearch", config=self.config)
+
+        # Category and author names live in small tables; resolve them to ids
+        # first, since Postgres cannot combine hashed subqueries with the GIN
+        # index and would scan every article instead
+        matches = Q(search_vector=search_query)
+        category_ids = list(Category.objects.filter(name__icontains=query).values_list("id", flat=True))
+        if category_ids:
+            matches |= Q(category_id__in=category_ids)
+        author_ids = list(Author.objects.filter(user__fullname__icontains=query).values_list("id", flat=True))
+        if author_ids:
+            matches |= Q(author_id__in=author_ids)
+        queryset = queryset.filter(matches)
+        if not ranked:
+            return queryset
+
+        return queryset.annotate(
+            rank=SearchRank(F("search_vector"), search_query)
+        ).order_by("-rank", "-created_at")
+
+    def index(self, article_ids):
+        Article.objects.filter(pk__in=article_ids).update(search_vector=self.get_vector())
+
+    def rebuild(self):
+        return Article.objects.update(search_vector=self.get_vector())
+
+
+class InvertedIndexSearchBackend(BaseSearchBackend):
+    """
+    BM25 search over the in-process inverted index in blog.search.index,
+    stored at BLOG_SEARCH_INDEX_PATH. Needs no database full-text support;
+    build it with ``manage.py rebuild_search_index``.
+    """
+
+    max_results = 1000
+
+    def __init__(self):
+        path = getattr(
+            settings, "BLOG_SEARCH_INDEX_PATH", os.path.join(settings.BASE_DIR, "search_index", "articles.idx")
+        )
+        compact_after = getattr(settings, "BLOG_SEARCH_INDEX_COMPACT_AFTER", 1000)
+        self.inverted_index = InvertedIndex(path, compact_after=compact_after)
+
+    def documents(self, queryset):
+        rows = queryset.values_list(
+            "id", "title", "excerpt", "content", "category__name", "author__user__fullname"
+        ).order_by()
+        for article_id, title, excerpt, content, category, author in rows.iterator(chunk_size=500):
+            yield article_id, {
+                "title": title,
+                "excerpt": excerpt,
+                "content": content,
+                "category": category,
+                "author": author,
+            }
+
+    def search(self, queryset, query, ranked=True):
+        scores = self.inverted_index.search(query)
+        ranking = sorted(scores, key=scores.get, reverse=True)
+
+        # The index also holds drafts and deleted articles, so the best
+        # max_results are picked among the ones the queryset allows
+        ids = []
+        for start in range(0, len(ranking), self.max_results):
+            batch = ranking[start:start + self.max_results]
+            allowed = set(queryset.filter(pk__in=batch).values_list("pk", flat=True))
+            ids += [pk for pk in batch if pk in allowed]
+            if len(ids) >= self.max_results:
+                break
+        ids = ids[: self.max_results]
+        if not ids:
+            return queryset.none()
+
+        queryset = queryset.filter(pk__in=ids)
+        if not ranked:
+            return queryset.order_by("-created_at")
+
+        ranking = Case(
+            *[When(pk=pk, then=position) for position, pk in enumerate(ids)],
+            output_field=IntegerField(),
+        )
+        return queryset.order_by(ranking)
+
+    def index(self, article_ids):
+        documents = list(self.documents(Article.objects.filter(pk__in=article_ids)))
+        self.inverted_index.update(documents)
+        found = {article_id for article_id, _ in documents}
+        self.remove([pk for pk in article_ids if pk not in found])
+
+    def remove(self, article_ids):
+        self.inverted_index.remove(article_ids)
+
+    def rebuild(self):
+        return self.inverted_index.rebuild(self.documents(Article.objects.all()))
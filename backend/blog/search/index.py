@@ -0,0 +1,455 @@
+"""
+Pure-Python inverted index with BM25 ranking.
+
+The bulk of the index is an immutable segment: posting lists stored as flat
+arrays in a single file that every worker memory-maps, so starting a worker
+does not rebuild anything. Articles changed since the segment was built go
+to an append-only log next to it; each process replays new log entries into
+a small in-memory delta before searching. Once the log holds
+``compact_after`` entries, the next write folds the delta into a new
+segment and empties the log, as a rebuild does.
+
+A segment is only ever swapped in together with its log rewrite, under the
+exclusive file lock, so a reader never pairs a new segment with an old log
+offset (or the reverse).
+"""
+import array
+import fcntl
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+
+TOKEN_RE = re.compile(r"\w+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have if in into is it its no not "
+    "of on or such that the their then there these they this to was were will with".split()
+)
+
+# Per-field term frequency multipliers (a simple BM25F)
+FIELD_WEIGHTS = {"title": 3, "excerpt": 2, "category": 2, "author": 2, "content": 1}
+
+K1 = 1.2
+B = 0.75
+
+MAGIC = b"BHSIDX01"
+# magic, documents, postings, term dictionary bytes, total document length
+HEADER = struct.Struct("<8sQQQd")
+
+
+# -------------------------
+# TEXT ANALYSIS
+# -------------------------
+VOWELS = frozenset("aeiou")
+
+STEP2_SUFFIXES = (
+    ("ational", "ate"), ("tional", "tion"), ("enci", "ence"), ("anci", "ance"),
+    ("izer", "ize"), ("abli", "able"), ("alli", "al"), ("entli", "ent"),
+    ("eli", "e"), ("ousli", "ous"), ("ization", "ize"), ("ation", "ate"),
+    ("ator", "ate"), ("alism", "al"), ("iveness", "ive"), ("fulness", "ful"),
+    ("ousness", "ous"), ("aliti", "al"), ("iviti", "ive"), ("biliti", "ble"),
+)
+
+STEP4_SUFFIXES = (
+    "ement", "ment", "ness", "ance", "ence", "able", "ible", "ant", "ent",
+    "ism", "ist", "iti", "ous", "ive", "ize", "al", "er", "ic",
+)
+
+
+def _has_vowel(word):
+    return any(char in VOWELS for char in word)
+
+
+def stem(word):
+    """A light subset of the Porter stemmer (plurals, -ed/-ing, common suffixes)."""
+    if len(word) <= 3 or not word.isalpha():
+        return word
+
+    if word.endswith("sses") or word.endswith("ies"):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us")):
+        word = word[:-1]
+
+    if word.endswith("eed"):
+        if len(word) > 4:
+            word = word[:-1]
+    else:
+        for suffix in ("ing", "ed"):
+            if word.endswith(suffix) and _has_vowel(word[: -len(suffix)]):
+                word = word[: -len(suffix)]
+                if word.endswith(("at", "bl", "iz")):
+                    word += "e"
+                elif len(word) > 2 and word[-1] == word[-2] and word[-1] not in "lsz":
+                    word = word[:-1]
+                break
+
+    if word.endswith("y") and _has_vowel(word[:-1]):
+        word = word[:-1] + "i"
+
+    for suffix, replacement in STEP2_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            word = word[: -len(suffix)] + replacement
+            break
+
+    for suffix in STEP4_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)]
+            break
+
+    return word
+
+
+def tokenize(text):
+    return [
+        stem(token)
+        for token in TOKEN_RE.findall((text or "").lower())
+        if token not in STOPWORDS
+    ]
+
+
+def analyze(fields):
+    """Turn {field: text} into ({term: weighted tf}, weighted document length)."""
+    terms = {}
+    length = 0
+    for field, text in fields.items():
+        weight = FIELD_WEIGHTS.get(field, 1)
+        for term in tokenize(text):
+            terms[term] = terms.get(term, 0) + weight
+            length += weight
+    return terms, length
+
+
+# -------------------------
+# SEGMENT (memory-mapped, immutable)
+# -------------------------
+class Segment:
+    def __init__(self, doc_ids, doc_lengths, posting_docs, posting_tfs, terms, total_length, mmap_obj=None):
+        self.doc_ids = doc_ids
+        self.doc_lengths = doc_lengths
+        self.posting_docs = posting_docs
+        self.posting_tfs = posting_tfs
+        self.terms = terms
+        self.total_length = total_length
+        self._mmap = mmap_obj
+        self._lengths_by_id = None
+
+    @classmethod
+    def empty(cls):
+        return cls(array.array("q"), array.array("I"), array.array("I"), array.array("H"), {}, 0.0)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, n_docs, n_postings, terms_size, total_length = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            mm.close()
+            raise ValueError(f"{path} is not a search index file")
+
+        view = memoryview(mm)
+        offset = HEADER.size
+        sections = []
+        for typecode, count in (("q", n_docs), ("I", n_docs), ("I", n_postings), ("H", n_postings)):
+            size = count * array.array(typecode).itemsize
+            sections.append(view[offset:offset + size].cast(typecode))
+            offset += size
+        terms = json.loads(bytes(view[offset:offset + terms_size]))
+
+        return cls(*sections, terms, total_length, mmap_obj=mm)
+
+    @staticmethod
+    def write(path, documents):
+        """
+        Build a segment file at ``path`` from an iterable of
+        (article_id, {term: tf}, length). Returns the number of documents.
+        """
+        doc_ids = array.array("q")
+        doc_lengths = array.array("I")
+        postings = {}
+        total_length = 0
+
+        for article_id, terms, length in documents:
+            doc_index = len(doc_ids)
+            doc_ids.append(article_id)
+            doc_lengths.append(length)
+            total_length += length
+            for term, tf in terms.items():
+                postings.setdefault(term, []).append((doc_index, min(tf, 0xFFFF)))
+
+        posting_docs = array.array("I")
+        posting_tfs = array.array("H")
+        term_offsets = {}
+        for term, entries in postings.items():
+            term_offsets[term] = [len(posting_docs), len(entries)]
+            for doc_index, tf in entries:
+                posting_docs.append(doc_index)
+                posting_tfs.append(tf)
+
+        terms_blob = json.dumps(term_offsets, separators=(",", ":")).encode()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(doc_ids), len(posting_docs), len(terms_blob), total_length))
+            for section in (doc_ids, doc_lengths, posting_docs, posting_tfs):
+                f.write(section.tobytes())
+            f.write(terms_blob)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(doc_ids)
+
+    def documents(self):
+        """Every (article_id, {term: tf}, length) in the segment, for merging it into a new one."""
+        doc_terms = [{} for _ in range(len(self.doc_ids))]
+        for term, (start, count) in self.terms.items():
+            for position in range(start, start + count):
+                doc_terms[self.posting_docs[position]][term] = self.posting_tfs[position]
+        return [
+            (self.doc_ids[doc_index], terms, self.doc_lengths[doc_index])
+            for doc_index, terms in enumerate(doc_terms)
+        ]
+
+    def document_length(self, article_id):
+        """Length of ``article_id`` in this segment, or None if it is not in it."""
+        if self._lengths_by_id is None:
+            self._lengths_by_id = dict(zip(self.doc_ids, self.doc_lengths))
+        return self._lengths_by_id.get(article_id)
+
+    def postings(self, term):
+        entry = self.terms.get(term)
+        if entry is None:
+            return
+        start, count = entry
+        for position in range(start, start + count):
+            doc_index = self.posting_docs[position]
+            yield self.doc_ids[doc_index], self.posting_tfs[position], self.doc_lengths[doc_index]
+
+    def close(self):
+        if self._mmap is not None:
+            for section in (self.doc_ids, self.doc_lengths, self.posting_docs, self.posting_tfs):
+                section.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+# -------------------------
+# INDEX (segment + change log)
+# -------------------------
+class InvertedIndex:
+    def __init__(self, path, compact_after=1000):
+        self.path = path
+        self.log_path = f"{path}.log"
+        self.lock_path = f"{path}.lock"
+        # Held by whoever builds a new segment, so two builds never interleave
+        self.writer_lock_path = f"{path}.writer.lock"
+        self.compact_after = compact_after
+        self._lock = threading.Lock()
+        self._segment = Segment.empty()
+        self._segment_stat = None
+        self._reset_delta()
+
+    def _reset_delta(self):
+        self._delta = {}  # article_id -> ({term: tf}, length)
+        self._shadowed = set()  # ids whose segment postings are stale
+        self._log_offset = 0
+        self._log_entries = 0
+
+    # -- locking / freshness --
+
+    def _file_lock(self, exclusive):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        lock_file = open(self.lock_path, "a")
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        return lock_file
+
+    def _writer_lock(self, blocking=True):
+        """The segment writer lock, or None when ``blocking`` is False and another process holds it."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        lock_file = open(self.writer_lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return None
+        return lock_file
+
+    def _stat(self, path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def refresh(self):
+        """Pick up a rebuilt segment and any log entries written by other processes."""
+        with self._lock:
+            segment_stat = self._stat(self.path)
+            log_stat = self._stat(self.log_path)
+            log_size = log_stat[2] if log_stat else 0
+            if segment_stat == self._segment_stat and log_size == self._log_offset:
+                return
+
+            with self._file_lock(exclusive=False):
+                segment_stat = self._stat(self.path)
+                log_stat = self._stat(self.log_path)
+                log_size = log_stat[2] if log_stat else 0
+                # A log shorter than what was read was rewritten with a new
+                # segment; start over from the segment either way
+                if segment_stat != self._segment_stat or log_size < self._log_offset:
+                    self._segment.close()
+                    self._segment = Segment.load(self.path) if segment_stat else Segment.empty()
+                    self._segment_stat = segment_stat
+                    self._reset_delta()
+                self._replay_log()
+
+    def _replay_log(self):
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        # Only consume complete lines
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            entry = json.loads(line)
+            self._apply(entry["id"], entry.get("terms"), entry.get("length", 0))
+            self._log_entries += 1
+        self._log_offset += end
+
+    def _apply(self, article_id, terms, length):
+        self._shadowed.add(article_id)
+        if terms is None:
+            self._delta.pop(article_id, None)
+        else:
+            self._delta[article_id] = (terms, length)
+
+    def _append(self, entries):
+        lines = b"".join(json.dumps(entry, separators=(",", ":")).encode() + b"\n" for entry in entries)
+        with self._file_lock(exclusive=True):
+            with open(self.log_path, "ab") as f:
+                f.write(lines)
+
+    # -- writes --
+
+    def update(self, documents):
+        """Index (article_id, {field: text}) pairs, replacing earlier versions."""
+        entries = []
+        for article_id, fields in documents:
+            terms, length = analyze(fields)
+            entries.append({"id": article_id, "terms": terms, "length": length})
+        if entries:
+            self._write_entries(entries)
+
+    def remove(self, article_ids):
+        entries = [{"id": article_id} for article_id in article_ids]
+        if entries:
+            self._write_entries(entries)
+
+    def _write_entries(self, entries):
+        self._append(entries)
+        self.refresh()
+        if self._log_entries >= self.compact_after:
+            self.compact()
+
+    def _swap_segment(self, documents, log_start):
+        """
+        Write ``documents`` as the new segment, keeping only the log entries
+        after ``log_start``: the ones written while the segment was built.
+        """
+        tmp_path = f"{self.path}.tmp"
+        count = Segment.write(tmp_path, documents)
+        with self._file_lock(exclusive=True):
+            try:
+                with open(self.log_path, "rb") as f:
+                    f.seek(log_start)
+                    tail = f.read()
+            except FileNotFoundError:
+                tail = b""
+            os.replace(tmp_path, self.path)
+            with open(self.log_path, "wb") as f:
+                f.write(tail)
+        return count
+
+    def rebuild(self, documents):
+        """Write a fresh segment from (article_id, {field: text}) pairs and reset the log."""
+        with self._writer_lock():
+            log_stat = self._stat(self.log_path)
+            log_start = log_stat[2] if log_stat else 0
+            count = self._swap_segment(
+                ((article_id, *analyze(fields)) for article_id, fields in documents), log_start
+            )
+        self.refresh()
+        return count
+
+    def compact(self):
+        """
+        Fold the log into a new segment built from the current segment and
+        delta. Skipped while another process builds a segment. Returns whether
+        it ran.
+        """
+        writer_lock = self._writer_lock(blocking=False)
+        if writer_lock is None:
+            return False
+        with writer_lock:
+            self.refresh()
+            with self._lock:
+                if self._log_entries < self.compact_after:
+                    return False
+                documents = [
+                    document for document in self._segment.documents()
+                    if document[0] not in self._shadowed
+                ]
+                documents += [
+                    (article_id, terms, length) for article_id, (terms, length) in self._delta.items()
+                ]
+                log_start = self._log_offset
+            self._swap_segment(documents, log_start)
+        self.refresh()
+        return True
+
+    # -- reads --
+
+    def search(self, query):
+        """Return {article_id: bm25 score} for documents matching any query term."""
+        self.refresh()
+        terms = set(tokenize(query))
+        if not terms:
+            return {}
+
+        with self._lock:
+            segment, delta, shadowed = self._segment, self._delta, self._shadowed
+            # Collection statistics count live documents only: shadowed
+            # segment documents are replaced by their delta version or gone
+            stale_lengths = [
+                length for length in map(segment.document_length, shadowed) if length is not None
+            ]
+            doc_count = max(len(segment.doc_ids) - len(stale_lengths) + len(delta), 1)
+            total_length = (
+                segment.total_length - sum(stale_lengths) + sum(length for _, length in delta.values())
+            )
+            avg_length = total_length / doc_count or 1
+
+            scores = {}
+            for term in terms:
+                postings = [
+                    posting for posting in segment.postings(term) if posting[0] not in shadowed
+                ]
+                postings += [
+                    (article_id, doc_terms[term], length)
+                    for article_id, (doc_terms, length) in delta.items()
+                    if term in doc_terms
+                ]
+                df = len(postings)
+                if not df:
+                    continue
+                idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+                for article_id, tf, length in postings:
+                    norm = tf + K1 * (1 - B + B * length / avg_length)
+                    scores[article_id] = scores.get(article_id, 0.0) + idf * tf * (K1 + 1) / norm
+            return scores
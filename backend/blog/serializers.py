@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from .models import Article
+from .images import get_storage, srcset
 from category.models import Category
+from core.utils.fast_serializers import FastSerializer, use_fast_serialization
 
 
 class ArticleSerializer(serializers.ModelSerializer):
@@ -13,7 +15,8 @@ class ArticleSerializer(serializers.ModelSerializer):
     category_name = serializers.CharField(source="category.name", read_only=True)
     author_name = serializers.CharField(source="author.user.fullname", read_only=True)
     status = serializers.SerializerMethodField()
-
+    # {"webp": "<url> 320w, <url> 640w, ...", "avif": ...}; empty until the variants are built
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Article
@@ -24,18 +27,23 @@ class ArticleSerializer(serializers.ModelSerializer):
             "content",
             "excerpt",
             "featured_image",
+            "srcset",
             "author",
             "author_name",
             "category",
             "category_name",
             "view_count",
+            "comment_count",
+            "bookmark_count",
             "created_at",
             "updated_at",
             "is_published",
             "is_deleted",
             "status",
         ]
-        read_only_fields = ["slug", "created_at", "updated_at", "view_count", "author"]
+        read_only_fields = [
+            "slug", "created_at", "updated_at", "view_count", "comment_count", "bookmark_count", "author",
+        ]
 
     def create(self, validated_data):
         # Ensure category exists if provided
@@ -50,3 +58,73 @@ class ArticleSerializer(serializers.ModelSerializer):
         if obj.is_published:
             return "published"
         return "draft"
+
+    def get_srcset(self, obj):
+        request = self.context.get("request")
+        storage = get_storage()
+
+        def url(name):
+            location = storage.url(name)
+            return request.build_absolute_uri(location) if request is not None else location
+
+        return srcset(obj.image_variants, url)
+
+
+class ArticleListSerializer(ArticleSerializer):
+    """Compact listing representation: what an article card needs, without the body."""
+
+    class Meta(ArticleSerializer.Meta):
+        fields = [
+            "id",
+            "title",
+            "slug",
+            "excerpt",
+            "featured_image",
+            "srcset",
+            "author",
+            "author_name",
+            "category",
+            "category_name",
+            "view_count",
+            "comment_count",
+            "bookmark_count",
+            "created_at",
+            "is_published",
+            "status",
+        ]
+
+
+def select_article_representation(request, queryset, default="full"):
+    """
+    Pick the article representation for a list endpoint from ?fields=compact|full
+    (falling back to the endpoint's ``default``) and return the matching
+    (queryset, serializer_class). Compact listings never load ``content``.
+    """
+    if request.GET.get("fields", default) == "compact":
+        return queryset.compact(), ArticleListSerializer
+    return queryset, ArticleSerializer
+
+
+class ArticleFastSerializer(FastSerializer):
+    serializer_class = ArticleSerializer
+    method_field_sources = {
+        "status": ("is_deleted", "is_published"),
+        "srcset": ("image_variants",),
+    }
+
+
+class ArticleListFastSerializer(ArticleFastSerializer):
+    serializer_class = ArticleListSerializer
+
+
+FAST_SERIALIZERS = {
+    ArticleSerializer: ArticleFastSerializer,
+    ArticleListSerializer: ArticleListFastSerializer,
+}
+
+
+def get_fast_serializer(serializer_class):
+    """The fast-path equivalent of ``serializer_class``, or None when disabled/unavailable."""
+    if not use_fast_serialization():
+        return None
+    return FAST_SERIALIZERS.get(serializer_class)
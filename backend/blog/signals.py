@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.utils.cache import invalidate_tags
+
+from .models import Article
+from .rollups import record_daily_views
+from .search import get_search_backend
+from .stats import invalidate_article_stats
+from .trending import record_events
+from .view_counter import views_flushed
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def article_changed(sender, instance, **kwargs):
+    invalidate_article_stats()
+    invalidate_tags("articles")
+
+
+@receiver(post_save, sender=Article)
+def index_article(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_search_backend().index([instance.pk])
+
+
+@receiver(post_delete, sender=Article)
+def unindex_article(sender, instance, **kwargs):
+    get_search_backend().remove([instance.pk])
+
+
+@receiver(views_flushed)
+def roll_up_views(sender, counts, **kwargs):
+    record_daily_views(counts)
+
+
+@receiver(views_flushed)
+def trend_views(sender, counts, **kwargs):
+    record_events((article_id, "view", views, None) for article_id, views in counts.items())
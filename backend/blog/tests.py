@@ -1,3 +1,569 @@
-from django.test import TestCase
+import fcntl
+import io
+import os
+import tempfile
+import time
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from authors.models import Author
+from category.models import Category
+from core.utils.media import UNSATISFIABLE, parse_range, serve
+from users.models import User
+
+from .images import get_storage, release_image
+from .models import Article
+from .search.backends import InvertedIndexSearchBackend
+from .search.index import InvertedIndex
+from .stats import ARTICLE_STATS_CACHE_KEY, get_article_stats
+from .uploads import UploadError, append_chunk, complete_upload, part_path, start_upload
+from .view_counter import ManualViewBuffer, get_view_buffer
+
+
+def make_author(index):
+    user = User.objects.create_user(
+        email=f"author{index}@example.com", fullname=f"Author {index}", is_author=True
+    )
+    return Author.objects.create(user=user)
+
+
+class QueryCountTestCase(APITestCase):
+    """
+    Each endpoint must run the same number of queries however many rows it
+    returns, so a relation read per row (an N+1) fails the test.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.authors = [make_author(index) for index in range(12)]
+        cls.categories = [Category.objects.create(name=f"Category {index}") for index in range(4)]
+        cls.small_category = Category.objects.create(name="Small category")
+
+        articles = [
+            Article(
+                title=f"Common article {index}",
+                slug=f"common-article-{index}",
+                content="Shared body text",
+                author=cls.authors[index % len(cls.authors)],
+                category=cls.categories[index % len(cls.categories)],
+                is_published=True,
+            )
+            for index in range(24)
+        ]
+        # A prolific author whose articles span every category
+        articles += [
+            Article(
+                title=f"Common prolific article {index}",
+                slug=f"common-prolific-article-{index}",
+                content="Shared body text",
+                author=cls.authors[0],
+                category=cls.categories[index % len(cls.categories)],
+                is_published=True,
+            )
+            for index in range(8)
+        ]
+        articles.append(
+            Article(
+                title="Common small article",
+                slug="common-small-article",
+                content="Shared body text",
+                author=cls.authors[1],
+                category=cls.small_category,
+                is_published=True,
+            )
+        )
+        # Saved one by one so the search backend indexes them
+        for article in articles:
+            article.save()
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url):
+        # Cached responses and stats would make the second request cheaper
+        cache.clear()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return response
+
+    def assertConstantQueries(self, small_url, large_url):
+        with CaptureQueriesContext(connection) as queries:
+            small = self.get(small_url)
+        with self.assertNumQueries(len(queries)):
+            large = self.get(large_url)
+        return small.json(), large.json()
+
+
+class ArticleListQueryTests(QueryCountTestCase):
+    def test_list(self):
+        small, large = self.assertConstantQueries("/api/blog/list/?limit=2", "/api/blog/list/?limit=20")
+        self.assertEqual((len(small["results"]["data"]), len(large["results"]["data"])), (2, 20))
+
+    def test_list_compact(self):
+        self.assertConstantQueries(
+            "/api/blog/list/?limit=2&fields=compact", "/api/blog/list/?limit=20&fields=compact"
+        )
+
+    def test_list_cursor(self):
+        small, large = self.assertConstantQueries(
+            "/api/blog/list/?pagination=cursor&limit=2", "/api/blog/list/?pagination=cursor&limit=20"
+        )
+        self.assertEqual((len(small["results"]["data"]), len(large["results"]["data"])), (2, 20))
+
+    def test_latest(self):
+        small, large = self.assertConstantQueries("/api/blog/latest/?limit=2", "/api/blog/latest/?limit=20")
+        self.assertEqual((len(small["data"]["articles"]), len(large["data"]["articles"])), (2, 20))
+
+    def test_search(self):
+        small, large = self.assertConstantQueries(
+            "/api/blog/search/?q=common&limit=2", "/api/blog/search/?q=common&limit=20"
+        )
+        self.assertEqual((len(small["data"]), len(large["data"])), (2, 20))
+
+    def test_search_cursor(self):
+        self.assertConstantQueries(
+            "/api/blog/search/?q=common&pagination=cursor&limit=2",
+            "/api/blog/search/?q=common&pagination=cursor&limit=20",
+        )
+
+
+class ArticleGroupQueryTests(QueryCountTestCase):
+    def test_category(self):
+        small, large = self.assertConstantQueries(
+            f"/api/category/{self.small_category.pk}/", f"/api/category/{self.categories[0].pk}/"
+        )
+        self.assertEqual(
+            (len(small["data"]["articles"]["results"]), len(large["data"]["articles"]["results"])), (1, 8)
+        )
+
+    def test_category_slug(self):
+        self.assertConstantQueries(
+            f"/api/category/{self.small_category.slug}/", f"/api/category/{self.categories[0].slug}/"
+        )
+
+    def test_author(self):
+        small, large = self.assertConstantQueries(
+            f"/api/blog/author/{self.authors[11].pk}/", f"/api/blog/author/{self.authors[0].pk}/"
+        )
+        self.assertEqual((small["count"], large["count"]), (2, 10))
+
+    def test_my_articles(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.force_authenticate(self.authors[11].user)
+            self.get("/api/blog/my-articles/")
+        self.client.force_authenticate(self.authors[0].user)
+        with self.assertNumQueries(len(queries)):
+            self.get("/api/blog/my-articles/")
+
+    def test_detail(self):
+        self.assertConstantQueries("/api/blog/common-article-0/", "/api/blog/common-small-article/")
+
+    def test_retrieve(self):
+        small = Article.objects.get(slug="common-small-article")
+        large = Article.objects.get(slug="common-article-0")
+        self.assertConstantQueries(f"/api/blog/retrieve/{small.pk}/", f"/api/blog/retrieve/{large.pk}/")
+
+
+class AuthorListQueryTests(QueryCountTestCase):
+    def test_author_list(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.get("/api/authors/list/")
+        for index in range(12, 30):
+            make_author(index)
+        with self.assertNumQueries(len(queries)):
+            response = self.get("/api/authors/list/")
+        self.assertEqual(len(response.json()), 30)
+
+
+@override_settings(RESPONSE_CACHE={"ENABLED": True})
+class CounterCacheTests(APITestCase):
+    """Comment and bookmark counters update the cached article responses that show them."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = make_author(0)
+        cls.article = Article.objects.create(
+            title="Counted", slug="counted", content="Body", author=cls.author, is_published=True
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def counts(self):
+        latest = self.client.get("/api/blog/latest/").json()["data"]["articles"][0]
+        detail = self.client.get("/api/blog/counted/").json()["data"]
+        return [(data["comment_count"], data["bookmark_count"]) for data in (latest, detail)]
+
+    def test_counters_invalidate_cached_responses(self):
+        from bookmarks.models import Bookmark
+        from comments.models import Comment
+
+        self.assertEqual(self.counts(), [(0, 0), (0, 0)])
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(article=self.article, user=self.author.user, content="First")
+        self.assertEqual(self.counts(), [(1, 0), (1, 0)])
+        with self.captureOnCommitCallbacks(execute=True):
+            Bookmark.objects.create(article=self.article, user=self.author.user)
+        self.assertEqual(self.counts(), [(1, 1), (1, 1)])
+
+
+@override_settings(RESPONSE_CACHE={"ENABLED": True})
+class AuthorRenameTests(APITestCase):
+    """Renaming an author's user changes ETags and cached responses that show the name."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = make_author(0)
+        cls.article = Article.objects.create(
+            title="Named", slug="named", content="Body", author=cls.author, is_published=True
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def rename(self):
+        user = self.author.user
+        user.fullname = "Renamed Author"
+        user.save()
+
+    def test_etags_change(self):
+        urls = [f"/api/blog/retrieve/{self.article.pk}/", "/api/authors/list/"]
+        etags = {url: self.client.get(url)["ETag"] for url in urls}
+        for url in urls:
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etags[url]).status_code, 304)
+        self.rename()
+
+        for url in urls:
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etags[url]).status_code, 200, url)
+        response = self.client.get(urls[0])
+        self.assertEqual(response.json()["data"]["author_name"], "Renamed Author")
+
+    def test_cached_responses_change(self):
+        self.client.get("/api/blog/latest/")
+        self.rename()
+        article = self.client.get("/api/blog/latest/").json()["data"]["articles"][0]
+        self.assertEqual(article["author_name"], "Renamed Author")
+
+
+class ArticleDeleteTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = make_author(0)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=directory.name))
+        self.client.force_authenticate(self.author.user)
+        storage = get_storage()
+        self.image = storage.save("articles_image_path/image.jpg", ContentFile(b"image"))
+        self.variant = storage.save("articles_image_path/variants/image-320.webp", ContentFile(b"variant"))
+
+    def create(self, slug):
+        return Article.objects.create(
+            title=slug, slug=slug, content="Body", author=self.author, featured_image=self.image,
+            image_variants={"webp": [[320, self.variant]]},
+        )
+
+    def delete(self, article):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f"/api/blog/delete/{article.pk}/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_delete_releases_the_image(self):
+        first, second = self.create("first"), self.create("second")
+        storage = get_storage()
+        self.delete(first)
+        self.assertTrue(storage.exists(self.image) and storage.exists(self.variant))
+        self.delete(second)
+        self.assertFalse(storage.exists(self.image) or storage.exists(self.variant))
+
+
+class ViewBufferTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.article = Article.objects.create(
+            title="Viewed", slug="viewed", content="Body", author=make_author(0), is_published=True
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.view_buffer = get_view_buffer()
+        self.view_buffer.drain()
+
+    def test_views_are_written_when_the_test_flushes(self):
+        # The test runner's buffer has no timer and no drain at exit
+        self.assertIsInstance(self.view_buffer, ManualViewBuffer)
+        response = self.client.get("/api/blog/viewed/")
+        self.assertEqual(response.json()["data"]["view_count"], 1)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.view_count, 0)
+
+        self.assertEqual(self.view_buffer.flush(), {self.article.pk: 1})
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.view_count, 1)
+
+    def test_flush_command_needs_a_shared_buffer(self):
+        self.view_buffer.record(self.article.pk)
+        with self.assertRaises(CommandError):
+            call_command("flush_view_counts")
+        self.assertEqual(self.view_buffer.pending(self.article.pk), 1)
+
+
+class ConditionalGetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.authors = [make_author(index) for index in range(2)]
+
+    def test_if_modified_since_does_not_hide_a_delete(self):
+        response = self.client.get("/api/authors/list/")
+        self.assertIn("ETag", response)
+        self.assertNotIn("Last-Modified", response)
+        # Deleting a row leaves MAX(updated_at) where it was
+        self.authors[0].delete()
+
+        since = http_date(time.time() + 3600)
+        response = self.client.get("/api/authors/list/", HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+
+class ArticleStatsCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_no_snapshot_in_a_per_process_cache(self):
+        self.assertEqual(get_article_stats()["total"], 0)
+        self.assertIsNone(cache.get(ARTICLE_STATS_CACHE_KEY))
+
+    def test_snapshot_in_a_shared_cache(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        shared = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": directory.name,
+            }
+        }
+        with self.settings(CACHES=shared):
+            get_article_stats()
+            self.assertEqual(cache.get(ARTICLE_STATS_CACHE_KEY)["total"], 0)
+            make_author(0).articles.create(title="Counted", slug="counted", content="Body")
+            self.assertEqual(get_article_stats()["total"], 1)
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_off_with_a_per_process_cache(self):
+        # The test settings use the local memory fallback
+        self.assertNotIn("X-Cache", self.client.get("/api/blog/latest/"))
+        with self.settings(RESPONSE_CACHE={"ENABLED": True}):
+            self.assertEqual(self.client.get("/api/blog/latest/")["X-Cache"], "MISS")
+            self.assertEqual(self.client.get("/api/blog/latest/")["X-Cache"], "HIT")
+
+
+@override_settings(RESPONSE_CACHE={"ENABLED": True}, ALLOWED_HOSTS=["one.example", "two.example"])
+class ResponseCacheKeyTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = make_author(0)
+        cls.category = Category.objects.create(name="Paged")
+        # One more than the category page size, so there is a next link
+        for index in range(11):
+            Article.objects.create(
+                title=f"Paged {index}", slug=f"paged-{index}", content="Body", author=author,
+                category=cls.category, is_published=True,
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_links_follow_the_host_and_scheme(self):
+        url = f"/api/category/{self.category.pk}/"
+        requests = [
+            ("one.example", False, "http://one.example/"),
+            ("two.example", False, "http://two.example/"),
+            ("two.example", True, "https://two.example/"),
+        ]
+        for host, secure, prefix in requests:
+            response = self.client.get(url, HTTP_HOST=host, secure=secure)
+            self.assertEqual(response["X-Cache"], "MISS")
+            self.assertTrue(response.json()["data"]["articles"]["next"].startswith(prefix))
+
+
+class MediaRangeTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        os.makedirs(os.path.join(self.root, "articles_image_path"))
+        with open(os.path.join(self.root, "articles_image_path", "image.jpg"), "wb") as file:
+            file.write(b"0123456789")
+
+    def get(self, byte_range):
+        request = RequestFactory().get("/", HTTP_RANGE=byte_range)
+        response = serve(request, "articles_image_path/image.jpg", document_root=self.root)
+        self.addCleanup(response.close)
+        return response
+
+    def test_ranges(self):
+        self.assertEqual(parse_range("bytes=2-4", 10), (2, 4))
+        self.assertEqual(parse_range("bytes=8-", 10), (8, 9))
+        self.assertEqual(parse_range("bytes=-3", 10), (7, 9))
+        self.assertEqual(parse_range("bytes=5-30", 10), (5, 9))
+        self.assertIs(parse_range("bytes=10-12", 10), UNSATISFIABLE)
+
+    def test_invalid_range_is_ignored(self):
+        self.assertIsNone(parse_range("bytes=5-3", 10))
+        response = self.get("bytes=5-3")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+
+    def test_range_past_the_end_is_unsatisfiable(self):
+        self.assertEqual(self.get("bytes=10-").status_code, 416)
+
+
+class InvertedIndexTests(SimpleTestCase):
+    documents = {
+        1: {"title": "Python tips", "content": "python django python"},
+        2: {"title": "Django models", "content": "django orm queries"},
+        3: {"title": "Rust", "content": "rust python bindings"},
+        4: {"title": "Gardening", "content": "tomatoes"},
+    }
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def make_index(self, name="articles.idx", **kwargs):
+        return InvertedIndex(os.path.join(self.directory, name), **kwargs)
+
+    def assertSameScores(self, index, documents, query):
+        fresh = self.make_index("fresh.idx")
+        fresh.rebuild(documents.items())
+        expected = fresh.search(query)
+        scores = index.search(query)
+        self.assertEqual(set(scores), set(expected))
+        for article_id, score in expected.items():
+            self.assertAlmostEqual(scores[article_id], score)
+
+    def test_updates_score_like_a_fresh_index(self):
+        index = self.make_index()
+        index.rebuild(self.documents.items())
+        documents = dict(self.documents)
+        documents[1] = {"title": "Python", "content": "a much longer python article " * 20}
+        index.update([(1, documents[1])])
+        del documents[2]
+        index.remove([2])
+        self.assertSameScores(index, documents, "python django")
+
+    def test_compaction_folds_the_log_into_the_segment(self):
+        index = self.make_index(compact_after=3)
+        index.rebuild(self.documents.items())
+        documents = dict(self.documents)
+        for article_id in (5, 6, 7):
+            documents[article_id] = {"title": f"Python {article_id}", "content": "python"}
+            index.update([(article_id, documents[article_id])])
+        self.assertEqual(os.path.getsize(index.log_path), 0)
+        self.assertEqual(len(index._segment.doc_ids), 7)
+        self.assertSameScores(index, documents, "python")
+
+    def test_reader_recovers_from_a_rewritten_log(self):
+        writer, reader = self.make_index(), self.make_index()
+        writer.rebuild(self.documents.items())
+        writer.update([(article_id, {"title": "filler"}) for article_id in range(10, 20)])
+        reader.search("python")
+        # The log shrinks below the reader's offset, then gets a new entry
+        with open(writer.log_path, "wb"):
+            pass
+        writer.update([(8, {"title": "Python"})])
+        self.assertIn(8, reader.search("python"))
+
+
+class InvertedIndexBackendTests(APITestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "articles.idx")
+        self.enterContext(override_settings(BLOG_SEARCH_INDEX_PATH=path))
+
+    def test_max_results_counts_only_allowed_articles(self):
+        author = make_author(0)
+        # Drafts that score best must not crowd out the published article
+        for index in range(3):
+            Article.objects.create(
+                title=f"Python python python {index}", slug=f"draft-{index}", content="python",
+                author=author,
+            )
+        published = Article.objects.create(
+            title="Python", slug="published", content="other", author=author, is_published=True
+        )
+        backend = InvertedIndexSearchBackend()
+        backend.max_results = 2
+        backend.rebuild()
+
+        results = backend.search(Article.objects.filter(is_published=True), "python")
+        self.assertEqual(list(results), [published])
+
+
+class ChunkedUploadTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = make_author(0)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(override_settings(
+            MEDIA_ROOT=directory.name,
+            BLOG_CHUNKED_UPLOADS={"DIRECTORY": os.path.join(directory.name, "uploads")},
+        ))
+        image = io.BytesIO()
+        Image.new("RGB", (8, 8), "red").save(image, "PNG")
+        self.data = image.getvalue()
+        self.upload = start_upload(self.author.user, "red.png", len(self.data))
+
+    def test_chunk_is_streamed_outside_a_transaction(self):
+        depth = len(connection.atomic_blocks)
+        depths = []
+
+        class Stream(io.BytesIO):
+            def read(self, size=-1):
+                depths.append(len(connection.atomic_blocks))
+                return super().read(size)
+
+        upload = append_chunk(self.author.user, self.upload.pk, 0, Stream(self.data), len(self.data))
+        self.assertEqual((upload.received, upload.image_format), (len(self.data), "PNG"))
+        self.assertEqual(set(depths), {depth})
+
+    def test_second_writer_is_refused(self):
+        with open(part_path(self.upload), "r+b") as part:
+            fcntl.flock(part, fcntl.LOCK_EX)
+            with self.assertRaises(UploadError) as raised:
+                append_chunk(self.author.user, self.upload.pk, 0, io.BytesIO(self.data), len(self.data))
+        self.assertEqual(raised.exception.status_code, 409)
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.received, 0)
+
+    def test_release_keeps_an_image_an_upload_holds(self):
+        append_chunk(self.author.user, self.upload.pk, 0, io.BytesIO(self.data), len(self.data))
+        upload = complete_upload(self.author.user, self.upload.pk)
+        storage = get_storage()
+        self.assertTrue(storage.exists(upload.image))
+
+        release_image(upload.image)
+        self.assertTrue(storage.exists(upload.image))
+        upload.delete()
+        release_image(upload.image)
+        self.assertFalse(storage.exists(upload.image))
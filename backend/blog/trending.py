@@ -0,0 +1,220 @@
+"""
+Trending articles from exponentially decayed engagement.
+
+Every view, comment, comment like and bookmark adds ``weight * 2^(-age /
+half_life)`` to its article's score. Because the decay is the same for all
+articles, scores are stored as ``log(sum(weight * e^(rate * (t - EPOCH))))``:
+an event only ever touches its own article's row, and ordering by the
+stored value is the current ranking without rescaling anything.
+
+The top SIZE scores are kept as a list in the cache. New scores are merged
+into it as events arrive, and it is rebuilt from the score table at most
+every REFRESH_INTERVAL seconds, so the endpoint reads a ready ranking.
+"""
+import math
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone
+
+from .models import Article, ArticleTrendingScore, ArticleViewRollup
+
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+TOP_CACHE_KEY = "blog:trending:top"
+
+DEFAULTS = {
+    "HALF_LIFE_HOURS": 24,
+    "WEIGHTS": {"view": 1, "comment": 5, "like": 2, "bookmark": 8},
+    "SIZE": 50,  # articles kept in the cached ranking
+    "REFRESH_INTERVAL": 300,  # seconds before the ranking is rebuilt from the table
+    "WINDOW_HALF_LIVES": 10,  # how far back rebuild_trending replays events
+}
+
+
+def get_setting(name):
+    return getattr(settings, "BLOG_TRENDING", {}).get(name, DEFAULTS[name])
+
+
+def decay_rate():
+    return math.log(2) / (get_setting("HALF_LIFE_HOURS") * 3600)
+
+
+def log_weight(weight, when):
+    """The stored (log, epoch-relative) value of an event of ``weight`` at ``when``."""
+    return math.log(weight) + decay_rate() * (when - EPOCH).total_seconds()
+
+
+def current_score(log_score, now=None):
+    """Turn a stored score into today's decayed score."""
+    now = now or timezone.now()
+    return math.exp(log_score - decay_rate() * (now - EPOCH).total_seconds())
+
+
+def logaddexp(a, b):
+    if a is None:
+        return b
+    high = max(a, b)
+    return high + math.log1p(math.exp(-abs(a - b)))
+
+
+# -------------------------
+# EVENTS
+# -------------------------
+def record_events(events):
+    """Add events given as (article_id, kind, count, when) to the trending scores."""
+    weights = get_setting("WEIGHTS")
+    increments = {}
+    for article_id, kind, count, when in events:
+        weight = weights.get(kind, 0) * count
+        if weight > 0:
+            increments[article_id] = logaddexp(
+                increments.get(article_id), log_weight(weight, when or timezone.now())
+            )
+    if increments:
+        merge_top(add_scores(increments))
+
+
+def record_event(article_id, kind, count=1, when=None):
+    record_events([(article_id, kind, count, when)])
+
+
+def _log_add(value):
+    # log(e^score + e^value) without overflowing
+    return Greatest(F("score"), Value(value)) + Ln(1 + Exp(-Abs(F("score") - Value(value))))
+
+
+def add_scores(increments):
+    """Log-add ``increments`` ({article_id: value}) to stored scores; return the new scores."""
+    table = connection.ops.quote_name(ArticleTrendingScore._meta.db_table)
+    article_table = connection.ops.quote_name(Article._meta.db_table)
+
+    if connection.vendor == "postgresql":
+        values = ", ".join(["(%s, %s)"] * len(increments))
+        params = [value for item in increments.items() for value in item]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (article_id, score) "
+                f"SELECT v.article_id, v.score FROM (VALUES {values}) AS v(article_id, score) "
+                f"JOIN {article_table} a ON a.id = v.article_id "
+                f"ON CONFLICT (article_id) DO UPDATE SET score = "
+                f"GREATEST({table}.score, EXCLUDED.score) "
+                f"+ LN(1 + EXP(-ABS({table}.score - EXCLUDED.score))) "
+                f"RETURNING article_id, score",
+                params,
+            )
+            return dict(cursor.fetchall())
+
+    existing = set(Article.objects.filter(pk__in=increments).values_list("pk", flat=True))
+    with transaction.atomic():
+        for article_id, value in increments.items():
+            if article_id not in existing:
+                continue
+            rows = ArticleTrendingScore.objects.filter(article_id=article_id)
+            if rows.update(score=_log_add(value)):
+                continue
+            try:
+                with transaction.atomic():
+                    ArticleTrendingScore.objects.create(article_id=article_id, score=value)
+            except IntegrityError:
+                # Created concurrently since the update above
+                rows.update(score=_log_add(value))
+    return dict(
+        ArticleTrendingScore.objects.filter(article_id__in=existing).values_list("article_id", "score")
+    )
+
+
+# -------------------------
+# CACHED RANKING
+# -------------------------
+def rebuild_top():
+    size = get_setting("SIZE")
+    items = list(ArticleTrendingScore.objects.order_by("-score").values_list("article_id", "score")[:size])
+    cache.set(TOP_CACHE_KEY, {"built": time.time(), "items": items}, None)
+    return items
+
+
+def merge_top(scores):
+    """Fold fresh scores into the cached ranking; the other entries keep their order."""
+    top = cache.get(TOP_CACHE_KEY)
+    if top is None:
+        return
+    merged = dict(top["items"])
+    merged.update(scores)
+    items = sorted(merged.items(), key=lambda item: item[1], reverse=True)[:get_setting("SIZE")]
+    cache.set(TOP_CACHE_KEY, {"built": top["built"], "items": items}, None)
+
+
+def get_trending_ids():
+    """Article ids of the current ranking, best first."""
+    top = cache.get(TOP_CACHE_KEY)
+    if top is None or time.time() - top["built"] > get_setting("REFRESH_INTERVAL"):
+        items = rebuild_top()
+    else:
+        items = top["items"]
+    return [article_id for article_id, _ in items]
+
+
+def ranked(queryset, ids):
+    """Order ``queryset`` (already limited to ``ids``) by the ranking."""
+    return queryset.filter(pk__in=ids).order_by(
+        Case(*[When(pk=pk, then=Value(position)) for position, pk in enumerate(ids)])
+    )
+
+
+# -------------------------
+# REBUILD
+# -------------------------
+def replay_events(since):
+    """Yield (article_id, kind, count, when) for every stored event after ``since``."""
+    from bookmarks.models import Bookmark
+    from comments.models import Comment
+
+    # Rollups only know the day, so day views count at midday
+    rollups = ArticleViewRollup.objects.filter(
+        period=ArticleViewRollup.DAY, period_start__gte=since.date()
+    ).values_list("article_id", "period_start", "views")
+    for article_id, day, views in rollups.iterator():
+        midday = datetime.combine(day, datetime.min.time(), tzinfo=timezone.get_current_timezone())
+        yield article_id, "view", views, midday + timedelta(hours=12)
+
+    comments = Comment.objects.filter(created_at__gte=since).values_list("article_id", "created_at")
+    for article_id, created_at in comments.iterator():
+        yield article_id, "comment", 1, created_at
+
+    # Likes are not timestamped; they count from when the comment was written
+    likes = Comment.likes.through.objects.filter(comment__created_at__gte=since).values_list(
+        "comment__article_id", "comment__created_at"
+    )
+    for article_id, created_at in likes.iterator():
+        yield article_id, "like", 1, created_at
+
+    bookmarks = Bookmark.objects.filter(created_at__gte=since).values_list("article_id", "created_at")
+    for article_id, created_at in bookmarks.iterator():
+        yield article_id, "bookmark", 1, created_at
+
+
+def rebuild_scores():
+    """Recompute every score from the last WINDOW_HALF_LIVES half-lives of events."""
+    window = timedelta(hours=get_setting("HALF_LIFE_HOURS") * get_setting("WINDOW_HALF_LIVES"))
+    weights = get_setting("WEIGHTS")
+
+    scores = {}
+    for article_id, kind, count, when in replay_events(timezone.now() - window):
+        weight = weights.get(kind, 0) * count
+        if weight > 0:
+            scores[article_id] = logaddexp(scores.get(article_id), log_weight(weight, when))
+
+    with transaction.atomic():
+        ArticleTrendingScore.objects.all().delete()
+        ArticleTrendingScore.objects.bulk_create(
+            ArticleTrendingScore(article_id=article_id, score=score)
+            for article_id, score in scores.items()
+        )
+    rebuild_top()
+    return len(scores)
@@ -0,0 +1,104 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from authors.models import Author
+
+from .images import get_storage
+from .uploads import UploadError, append_chunk, complete_upload, get_upload, start_upload
+from .views import error_response, success_response
+
+
+def serialize_upload(request, upload):
+    image_url = None
+    if upload.image:
+        image_url = request.build_absolute_uri(get_storage().url(upload.image))
+    return {
+        "id": str(upload.id),
+        "filename": upload.filename,
+        "size": upload.size,
+        "offset": upload.received,
+        "status": upload.status,
+        "format": upload.image_format or None,
+        "width": upload.width,
+        "height": upload.height,
+        "image": image_url,
+    }
+
+
+def upload_error_response(request, error):
+    # Conflicts carry the upload so the client can resume from its offset
+    data = serialize_upload(request, error.upload) if error.upload is not None else None
+    return error_response(error.message, {"upload": data} if data else None, code=error.status_code)
+
+
+class CanUploadImages(IsAuthenticated):
+    """Only authors and admins write articles, so only they upload images."""
+
+    def has_permission(self, request, view):
+        if not super().has_permission(request, view):
+            return False
+        return request.user.is_admin or Author.objects.filter(user=request.user).exists()
+
+
+# -------------------------
+# START A CHUNKED UPLOAD
+# -------------------------
+class ImageUploadCreateView(APIView):
+    permission_classes = [CanUploadImages]
+
+    def post(self, request):
+        try:
+            upload = start_upload(request.user, request.data.get("filename"), request.data.get("size"))
+        except UploadError as error:
+            return upload_error_response(request, error)
+        return success_response(
+            serialize_upload(request, upload), "Upload started", code=status.HTTP_201_CREATED
+        )
+
+
+# -------------------------
+# UPLOAD STATUS / APPEND A CHUNK
+# -------------------------
+class ImageUploadDetailView(APIView):
+    permission_classes = [CanUploadImages]
+
+    def get(self, request, upload_id):
+        try:
+            upload = get_upload(request.user, upload_id)
+        except UploadError as error:
+            return upload_error_response(request, error)
+        return success_response(serialize_upload(request, upload), "Upload status")
+
+    def put(self, request, upload_id):
+        """Raw chunk bytes as the body, starting at the Upload-Offset header."""
+        try:
+            offset = request.META.get("HTTP_UPLOAD_OFFSET")
+            length = request.META.get("CONTENT_LENGTH")
+            upload = append_chunk(
+                request.user,
+                upload_id,
+                int(offset) if offset not in (None, "") else None,
+                # Read from the socket as it arrives; request.data is never touched
+                request.stream,
+                int(length) if length not in (None, "") else None,
+            )
+        except ValueError:
+            return error_response("Upload-Offset and Content-Length must be integers")
+        except UploadError as error:
+            return upload_error_response(request, error)
+        return success_response(serialize_upload(request, upload), "Chunk stored")
+
+
+# -------------------------
+# COMPLETE AN UPLOAD
+# -------------------------
+class ImageUploadCompleteView(APIView):
+    permission_classes = [CanUploadImages]
+
+    def post(self, request, upload_id):
+        try:
+            upload = complete_upload(request.user, upload_id)
+        except UploadError as error:
+            return upload_error_response(request, error)
+        return success_response(serialize_upload(request, upload), "Upload complete")
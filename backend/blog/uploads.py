@@ -0,0 +1,258 @@
+"""
+Resumable chunked uploads of featured images.
+
+A client starts an upload with the file name and size, sends the bytes in
+any number of PUT requests each tagged with the offset it starts at, and
+completes it. Chunks are copied from the request stream straight into a
+part file, so no request body is held in memory or spooled to a temporary
+file first. Until the image header has been recognised, the bytes also go
+through a Pillow ``ImageFile.Parser``, so a non-image is refused within its
+first HEADER_LIMIT bytes instead of after the whole file.
+
+A request that breaks off keeps what was written; the client asks for the
+upload's offset and carries on from there. Completing moves the file into
+article image storage, and article create/update take the finished upload
+by id through ``featured_image_upload``.
+"""
+import fcntl
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+from PIL import Image, ImageFile
+
+from .images import get_storage, release_image
+from .models import Article, ImageUpload
+
+READ_SIZE = 64 * 1024
+
+# Accepted Pillow formats and the extension the stored file gets
+EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp", "GIF": ".gif", "AVIF": ".avif"}
+
+DEFAULTS = {
+    "DIRECTORY": os.path.join(settings.BASE_DIR, "uploads"),
+    "MAX_SIZE": 25 * 1024 * 1024,
+    "MAX_PIXELS": 40_000_000,
+    "HEADER_LIMIT": 1024 * 1024,  # bytes within which the image header must appear
+    "EXPIRY_HOURS": 24,
+}
+
+
+def get_setting(name):
+    return getattr(settings, "BLOG_CHUNKED_UPLOADS", {}).get(name, DEFAULTS[name])
+
+
+class UploadError(Exception):
+    def __init__(self, message, status_code=400, upload=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.upload = upload
+
+
+def part_path(upload):
+    return os.path.join(get_setting("DIRECTORY"), f"{upload.pk}.part")
+
+
+def _locked(user, upload_id):
+    try:
+        return ImageUpload.objects.select_for_update().get(pk=upload_id, user=user)
+    except (ImageUpload.DoesNotExist, ValidationError):
+        raise UploadError("Upload not found", 404)
+
+
+def get_upload(user, upload_id):
+    try:
+        return ImageUpload.objects.get(pk=upload_id, user=user)
+    except (ImageUpload.DoesNotExist, ValidationError):
+        raise UploadError("Upload not found", 404)
+
+
+def discard(upload):
+    if os.path.exists(part_path(upload)):
+        os.remove(part_path(upload))
+    upload.delete()
+
+
+# -------------------------
+# UPLOAD STEPS
+# -------------------------
+def start_upload(user, filename, size):
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError("size must be the file size in bytes")
+    if size <= 0:
+        raise UploadError("size must be the file size in bytes")
+    if size > get_setting("MAX_SIZE"):
+        raise UploadError(f"Images are limited to {get_setting('MAX_SIZE')} bytes", 413)
+
+    filename = get_valid_filename(os.path.basename(filename or "")) or "image"
+    upload = ImageUpload.objects.create(user=user, filename=filename[:255], size=size)
+    os.makedirs(get_setting("DIRECTORY"), exist_ok=True)
+    open(part_path(upload), "wb").close()
+    return upload
+
+
+def _check_header(upload, parser):
+    image = parser.image
+    if image.format not in EXTENSIONS:
+        raise UploadError(f"Unsupported image format {image.format}", 415)
+    if image.width * image.height > get_setting("MAX_PIXELS"):
+        raise UploadError("Image dimensions are too large", 413)
+    upload.image_format = image.format
+    upload.width, upload.height = image.size
+
+
+def _check_chunk(upload, offset, length):
+    if upload.status != ImageUpload.PENDING:
+        raise UploadError("Upload is already complete", 409, upload)
+    if offset != upload.received:
+        raise UploadError("Offset does not match the upload", 409, upload)
+    if upload.received + length > upload.size:
+        raise UploadError("Chunk goes past the declared size", 413, upload)
+
+
+def append_chunk(user, upload_id, offset, stream, length):
+    """
+    Copy ``length`` bytes of ``stream`` into the upload at ``offset``, which
+    must be where the upload stands. Returns the upload; an image that fails
+    header validation is discarded.
+
+    The row is locked only to check the offset and, after the bytes are
+    written, to advance it: a slow client must not hold a transaction open.
+    An exclusive lock on the part file keeps out a second writer meanwhile.
+    """
+    if offset is None or length is None:
+        raise UploadError("Upload-Offset and Content-Length are required")
+
+    upload = get_upload(user, upload_id)
+    try:
+        part = open(part_path(upload), "r+b")
+    except FileNotFoundError:
+        raise UploadError("Upload not found", 404)
+
+    rejected = None
+    with part:
+        # One writer per upload: parallel chunks would interleave in the file
+        try:
+            fcntl.flock(part, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadError("Another chunk of this upload is being written", 409, upload)
+
+        with transaction.atomic():
+            upload = _locked(user, upload_id)
+            _check_chunk(upload, offset, length)
+
+        parser = None
+        if not upload.image_format:
+            # Header not seen yet: replay what came before (under HEADER_LIMIT)
+            parser = ImageFile.Parser()
+            if offset:
+                parser.feed(part.read(offset))
+        # Drop bytes a broken-off request wrote past the recorded offset
+        part.seek(offset)
+        part.truncate()
+
+        received = offset
+        remaining = length
+        while remaining:
+            chunk = stream.read(min(READ_SIZE, remaining))
+            if not chunk:
+                break
+            part.write(chunk)
+            remaining -= len(chunk)
+            received += len(chunk)
+
+            if parser is not None:
+                try:
+                    parser.feed(chunk)
+                    if parser.image is not None:
+                        _check_header(upload, parser)
+                        parser = None
+                    elif received >= get_setting("HEADER_LIMIT"):
+                        raise UploadError("File is not a supported image", 415)
+                except UploadError as error:
+                    rejected = error
+                    break
+                except Exception:
+                    rejected = UploadError("File is not a supported image", 415)
+                    break
+        part.flush()
+
+        if rejected is None:
+            with transaction.atomic():
+                current = _locked(user, upload_id)
+                _check_chunk(current, offset, length)
+                current.received = received
+                current.image_format = upload.image_format
+                current.width, current.height = upload.width, upload.height
+                current.save()
+            upload = current
+
+    if rejected is not None:
+        discard(upload)
+        raise rejected
+    return upload
+
+
+def complete_upload(user, upload_id):
+    """Check the received file and move it into article image storage."""
+    rejected = None
+    with transaction.atomic():
+        upload = _locked(user, upload_id)
+        if upload.status == ImageUpload.COMPLETE:
+            return upload
+        if upload.received != upload.size:
+            raise UploadError("Upload is missing bytes", 409, upload)
+
+        path = part_path(upload)
+        if not upload.image_format:
+            rejected = UploadError("File is not a supported image", 415)
+        else:
+            try:
+                with Image.open(path) as image:
+                    image.verify()
+            except Exception:
+                rejected = UploadError("Image data is corrupt", 415)
+
+        if rejected is None:
+            stem = os.path.splitext(upload.filename)[0]
+            upload_to = Article._meta.get_field("featured_image").upload_to
+            with open(path, "rb") as part:
+                upload.image = get_storage().save(
+                    f"{upload_to}/{stem}{EXTENSIONS[upload.image_format]}", File(part)
+                )
+            upload.status = ImageUpload.COMPLETE
+            upload.save()
+            transaction.on_commit(lambda: os.remove(path))
+
+    if rejected is not None:
+        discard(upload)
+        raise rejected
+    return upload
+
+
+def take_upload(user, upload_id):
+    """The user's finished upload ``upload_id``, for an article to use; None if there is none."""
+    try:
+        return ImageUpload.objects.get(pk=upload_id, user=user, status=ImageUpload.COMPLETE)
+    except (ImageUpload.DoesNotExist, ValidationError):
+        return None
+
+
+def clean_uploads():
+    """Drop uploads older than EXPIRY_HOURS that no article took. Returns how many."""
+    cutoff = timezone.now() - timedelta(hours=get_setting("EXPIRY_HOURS"))
+    expired = list(ImageUpload.objects.filter(updated_at__lt=cutoff))
+    for upload in expired:
+        image = upload.image
+        discard(upload)
+        if image:
+            release_image(image)
+    return len(expired)
@@ -7,6 +7,12 @@ from .analytics_views import (
     ViewAnalyticsAPIView,
 )
 
+from .upload_views import (
+    ImageUploadCompleteView,
+    ImageUploadCreateView,
+    ImageUploadDetailView,
+)
+
 from .views import (
     ArticleCreateView,
     ArticleDeleteByIdView,
@@ -52,6 +58,14 @@ urlpatterns = [
         "update/<int:article_id>/", ArticleUpdateView.as_view(), name="article-update"
     ),
     path("delete/<int:id>/", ArticleDeleteByIdView.as_view(), name="article-delete"),
+    # Chunked featured image uploads (before the slug route, which would match them)
+    path("uploads/", ImageUploadCreateView.as_view(), name="image-upload-create"),
+    path("uploads/<uuid:upload_id>/", ImageUploadDetailView.as_view(), name="image-upload-detail"),
+    path(
+        "uploads/<uuid:upload_id>/complete/",
+        ImageUploadCompleteView.as_view(),
+        name="image-upload-complete",
+    ),
     path("<slug:slug>/", ArticleDetailView.as_view(), name="article-detail-slug"),
 
     
@@ -0,0 +1,293 @@
+"""
+Write-behind view counter for articles.
+
+Views are accumulated in a buffer and written to the database in batches,
+either when the buffer holds FLUSH_THRESHOLD pending views or when
+FLUSH_INTERVAL seconds have passed, instead of one UPDATE per request.
+
+LocalViewBuffer keeps pending views in each process. RedisViewBuffer keeps
+them in a Redis hash shared by every process, which is what lets
+`manage.py flush_view_counts` write them from outside the web workers.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connection, transaction
+from django.db.models import F
+from django.dispatch import Signal, receiver
+from django.utils.module_loading import import_string
+
+from .models import Article
+
+logger = logging.getLogger(__name__)
+
+# Sent after buffered views have been written, with ``counts`` mapping
+# article id -> number of views added in that batch.
+views_flushed = Signal()
+
+DEFAULTS = {
+    "BACKEND": "blog.view_counter.LocalViewBuffer",
+    "FLUSH_INTERVAL": 5,
+    "FLUSH_THRESHOLD": 1000,
+    "BATCH_SIZE": 500,
+    "REDIS_URL": None,  # for RedisViewBuffer
+}
+
+
+def get_setting(name):
+    return getattr(settings, "BLOG_VIEW_COUNTER", {}).get(name, DEFAULTS[name])
+
+
+def write_view_counts(counts):
+    """Add ``counts`` ({article_id: views}) to Article.view_count in batches."""
+    items = list(counts.items())
+    batch_size = get_setting("BATCH_SIZE")
+    table = connection.ops.quote_name(Article._meta.db_table)
+
+    with transaction.atomic():
+        for start in range(0, len(items), batch_size):
+            batch = items[start:start + batch_size]
+
+            if connection.vendor == "postgresql":
+                values = ", ".join(["(%s, %s)"] * len(batch))
+                params = [value for item in batch for value in item]
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"UPDATE {table} SET view_count = {table}.view_count + v.delta "
+                        f"FROM (VALUES {values}) AS v(id, delta) "
+                        f"WHERE {table}.id = v.id",
+                        params,
+                    )
+            else:
+                for article_id, delta in batch:
+                    Article.objects.filter(pk=article_id).update(
+                        view_count=F("view_count") + delta
+                    )
+
+
+class ViewBuffer:
+    """
+    Interface for view buffers. Subclasses store pending views somewhere
+    (process memory, a shared store, ...) and implement record/pending/drain.
+    ``shared`` buffers can be drained by any process.
+    """
+
+    shared = False
+
+    def record(self, article_id, count=1):
+        raise NotImplementedError
+
+    def pending(self, article_id):
+        raise NotImplementedError
+
+    def drain(self):
+        """Remove and return all pending views as {article_id: views}."""
+        raise NotImplementedError
+
+    def restore(self, counts):
+        """Put drained views back after a failed write."""
+        raise NotImplementedError
+
+    def flush(self):
+        counts = self.drain()
+        if not counts:
+            return {}
+
+        try:
+            write_view_counts(counts)
+        except Exception:
+            logger.exception("Failed to flush %d buffered article views", sum(counts.values()))
+            self.restore(counts)
+            return {}
+
+        # The views are already saved; a failing receiver must not undo that
+        for receiver, result in views_flushed.send_robust(sender=self.__class__, counts=counts):
+            if isinstance(result, Exception):
+                logger.error("views_flushed receiver %r failed", receiver, exc_info=result)
+        return counts
+
+
+class LocalViewBuffer(ViewBuffer):
+    """
+    Process-local buffer. A daemon thread flushes it every FLUSH_INTERVAL
+    seconds and the remaining views are drained once at interpreter exit.
+    """
+
+    drain_at_exit = True
+
+    def __init__(self):
+        self.interval = get_setting("FLUSH_INTERVAL")
+        self.threshold = get_setting("FLUSH_THRESHOLD")
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._reset()
+        if self.drain_at_exit:
+            atexit.register(self.close)
+
+    def _reset(self):
+        # Called again in a forked worker so it never flushes the parent's views
+        self._pid = os.getpid()
+        self._counts = {}
+        self._total = 0
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None and self.interval:
+            self._thread = threading.Thread(
+                target=self._run, name="view-counter-flush", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.flush()
+            finally:
+                # Do not hold a connection open between flushes
+                connection.close()
+
+    def record(self, article_id, count=1):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            self._counts[article_id] = self._counts.get(article_id, 0) + count
+            self._total += count
+            should_flush = self._total >= self.threshold
+            self._ensure_thread()
+
+        if should_flush:
+            self.flush()
+
+    def pending(self, article_id):
+        return self._counts.get(article_id, 0)
+
+    def drain(self):
+        with self._lock:
+            counts, self._counts, self._total = self._counts, {}, 0
+        return counts
+
+    def restore(self, counts):
+        with self._lock:
+            for article_id, count in counts.items():
+                self._counts[article_id] = self._counts.get(article_id, 0) + count
+                self._total += count
+
+    def flush(self):
+        # Serialize flushes so the timer thread and a size-triggered flush
+        # do not write overlapping batches out of order
+        with self._flush_lock:
+            return super().flush()
+
+    def close(self):
+        self._stopped.set()
+        if self._pid == os.getpid():
+            self.flush()
+
+
+class ManualViewBuffer(LocalViewBuffer):
+    """
+    Process-local buffer that is written only when flush() is called: no
+    timer thread, no size trigger and no drain at exit. The test runner uses
+    it, since an exit drain would run after the test database is dropped
+    and write the tests' views to the real one.
+    """
+
+    drain_at_exit = False
+
+    def __init__(self):
+        super().__init__()
+        self.interval = 0
+        self.threshold = float("inf")
+
+
+class RedisViewBuffer(ViewBuffer):
+    """
+    Buffer shared by every process through a Redis hash of article id ->
+    pending views. Each process still flushes it every FLUSH_INTERVAL
+    seconds; draining renames the hash first, so concurrent drains never
+    write a view twice. Pending views survive a restart, so there is no
+    drain at exit.
+    """
+
+    shared = True
+    key = "blog:view-buffer"
+
+    def __init__(self):
+        import redis
+
+        self.client = redis.Redis.from_url(get_setting("REDIS_URL"))
+        self.interval = get_setting("FLUSH_INTERVAL")
+        self._thread_pid = None
+        self._thread_lock = threading.Lock()
+
+    def _ensure_thread(self):
+        # One flush thread per process, started again in a forked worker
+        if self.interval and self._thread_pid != os.getpid():
+            with self._thread_lock:
+                if self._thread_pid != os.getpid():
+                    self._thread_pid = os.getpid()
+                    threading.Thread(target=self._run, name="view-counter-flush", daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            finally:
+                connection.close()
+
+    def record(self, article_id, count=1):
+        self.client.hincrby(self.key, article_id, count)
+        self._ensure_thread()
+
+    def pending(self, article_id):
+        return int(self.client.hget(self.key, article_id) or 0)
+
+    def drain(self):
+        import redis
+
+        draining = f"{self.key}:draining:{uuid.uuid4().hex}"
+        try:
+            self.client.rename(self.key, draining)
+        except redis.ResponseError:
+            # No such key: nothing is pending
+            return {}
+        pipeline = self.client.pipeline()
+        pipeline.hgetall(draining)
+        pipeline.delete(draining)
+        counts, _ = pipeline.execute()
+        return {int(article_id): int(count) for article_id, count in counts.items()}
+
+    def restore(self, counts):
+        pipeline = self.client.pipeline()
+        for article_id, count in counts.items():
+            pipeline.hincrby(self.key, article_id, count)
+        pipeline.execute()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+@receiver(setting_changed)
+def reset_view_buffer(setting, **kwargs):
+    # override_settings(BLOG_VIEW_COUNTER=...) takes effect on the next call
+    global _buffer
+    if setting == "BLOG_VIEW_COUNTER":
+        _buffer = None
+
+
+def get_view_buffer():
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = import_string(get_setting("BACKEND"))()
+    return _buffer
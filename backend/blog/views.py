@@ -1,18 +1,26 @@
-import os
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
-from django.db.models import F, Q
-from django.db.models import Sum
+from django.db import transaction
+from django.db.models import Count, Max, Sum
 from django.shortcuts import get_object_or_404
 import logging
 
+from core.utils.cache import CachedResponseMixin
+from core.utils.conditional import ConditionalGetMixin
+from core.utils.pagination import KeysetPagination, use_cursor_pagination
+
 from category.models import Category
+from .images import release_image, schedule_variants
 from .models import Article
 from authors.models import Author
-from .serializers import ArticleSerializer
+from .search import get_search_backend
+from .serializers import ArticleSerializer, get_fast_serializer, select_article_representation
+from .stats import get_article_stats
+from .uploads import take_upload
+from .view_counter import get_view_buffer
 
 logger = logging.getLogger(__name__) 
 
@@ -31,6 +39,21 @@ def error_response(message="Error", errors=None, code=status.HTTP_400_BAD_REQUES
     )
 
 
+class ArticleConditionalMixin(ConditionalGetMixin):
+    """Conditional GET for article payloads, which also show view counts and category/author data."""
+
+    conditional_aggregates = {
+        "updated_at": Max("updated_at"),
+        "count": Count("pk"),
+        "view_count": Sum("view_count"),
+        "comment_count": Sum("comment_count"),
+        "bookmark_count": Sum("bookmark_count"),
+        "category_updated_at": Max("category__updated_at"),
+        "author_updated_at": Max("author__updated_at"),
+        "author_user_updated_at": Max("author__user__updated_at"),
+    }
+
+
 # -------------------------
 # ARTICLE CREATE
 # -------------------------
@@ -51,9 +74,27 @@ class ArticleCreateView(APIView):
                     code=status.HTTP_403_FORBIDDEN,
                 )
 
+        # A finished chunked upload can stand in for a multipart featured_image
+        upload = None
+        if request.data.get("featured_image_upload"):
+            upload = take_upload(user, request.data["featured_image_upload"])
+            if upload is None:
+                return error_response(
+                    "Validation error",
+                    {"featured_image_upload": ["No finished upload with this id"]},
+                )
+
         serializer = ArticleSerializer(data=request.data)
         if serializer.is_valid():
-            article = serializer.save(author=author) if author else serializer.save()
+            save_kwargs = {"author": author} if author else {}
+            if upload:
+                save_kwargs["featured_image"] = upload.image
+            with transaction.atomic():
+                article = serializer.save(**save_kwargs)
+                if upload:
+                    upload.delete()
+            # Resized copies are built off the request thread after commit
+            schedule_variants(article)
             return success_response(
                 ArticleSerializer(article).data,
                 "Article created successfully",
@@ -69,6 +110,13 @@ class ArticleCreateView(APIView):
 class MyArticlesView(APIView):
     permission_classes = [IsAuthenticated]
 
+    def get_articles(self, request, author):
+        # All articles by this author (including drafts)
+        articles = Article.objects.for_listing().filter(author=author, is_deleted=False).order_by(
+            "-created_at"
+        )
+        return select_article_representation(request, articles)
+
     def get(self, request):
 
         try:
@@ -84,12 +132,8 @@ class MyArticlesView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Get all articles by this author (including drafts)
-        articles = Article.objects.filter(author=author, is_deleted=False).order_by(
-            "-created_at"
-        )
-
-        serializer = ArticleSerializer(articles, many=True)
+        articles, serializer_class = self.get_articles(request, author)
+        serializer = serializer_class(articles, many=True)
 
         return Response(
             {
@@ -104,14 +148,16 @@ class MyArticlesView(APIView):
 # -------------------------
 # ARTICLE RETRIEVE BY ID
 # -------------------------
-class ArticleRetrieveView(APIView):
+class ArticleRetrieveView(ArticleConditionalMixin, APIView):
     permission_classes = [permissions.AllowAny]
 
+    def get_conditional_queryset(self, request, article_id):
+        return Article.objects.filter(id=article_id, is_deleted=False)
+
     def get(self, request, article_id):
         try:
             article = (
-                Article.objects
-                .select_related("author", "author__user", "category")
+                Article.objects.for_listing()
                 .get(id=article_id, is_deleted=False)
             )
             
@@ -131,6 +177,13 @@ class ArticleRetrieveView(APIView):
 class ArticlesByAuthorView(APIView):
     permission_classes = [permissions.AllowAny]
 
+    def get_articles(self, request, author):
+        # Published articles by this author
+        articles = Article.objects.for_listing().filter(author=author, is_published=True).order_by(
+            "-created_at"
+        )
+        return select_article_representation(request, articles)
+
     def get(self, request, author_id):
 
         try:
@@ -147,12 +200,8 @@ class ArticlesByAuthorView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        # Get published articles by this author
-        articles = Article.objects.filter(author=author, is_published=True).order_by(
-            "-created_at"
-        )
-
-        serializer = ArticleSerializer(articles, many=True)
+        articles, serializer_class = self.get_articles(request, author)
+        serializer = serializer_class(articles, many=True)
 
         return Response(
             {
@@ -177,47 +226,39 @@ class ArticlePagination(PageNumberPagination):
 
 class ArticleListView(APIView):
     permission_classes = [permissions.AllowAny]
+    # ?sort= options; offset pages order by the first column, cursor pages by both
+    orderings = {
+        "views_asc": ("view_count", "id"),
+        "views_desc": ("-view_count", "-id"),
+        "date_asc": ("created_at", "id"),
+        "date_desc": ("-created_at", "-id"),
+    }
+
+    def get_articles(self, request):
+        # Base query (?fields=compact drops the article body)
+        articles = Article.objects.for_listing().filter(is_deleted=False)
+        return select_article_representation(request, articles)
 
     def get(self, request):
-        sort = request.GET.get("sort", "date_desc")
-        # sort options: views_asc, views_desc, date_asc, date_desc
-
-        # Base query
-        articles = Article.objects.filter(is_deleted=False)
-
-        # Apply sorting
-        if sort == "views_asc":
-            articles = articles.order_by("view_count")
-        elif sort == "views_desc":
-            articles = articles.order_by("-view_count")
-        elif sort == "date_asc":
-            articles = articles.order_by("created_at")
-        else:  # date_desc (default)
-            articles = articles.order_by("-created_at")
-
-        # Pagination
-        paginator = ArticlePagination()
+        articles, serializer_class = self.get_articles(request)
+        ordering = self.orderings.get(request.GET.get("sort"), self.orderings["date_desc"])
+
+        # Pagination (?pagination=cursor switches to keyset pages without a count)
+        if use_cursor_pagination(request):
+            paginator = KeysetPagination(ordering)
+        else:
+            articles = articles.order_by(ordering[0])
+            paginator = ArticlePagination()
+            # Offset pages can be built straight from values() rows
+            fast_serializer_class = get_fast_serializer(serializer_class)
+            if fast_serializer_class:
+                articles = fast_serializer_class.values(articles)
+                serializer_class = fast_serializer_class
         paginated_articles = paginator.paginate_queryset(articles, request)
-        serializer = ArticleSerializer(paginated_articles, many=True)
+        serializer = serializer_class(paginated_articles, many=True)
 
-        # ---> Compute total views
-        total_views_agg = Article.objects.filter(is_deleted=False).aggregate(
-            total_views=Sum("view_count")
-        )
-        total_views = total_views_agg.get("total_views") or 0
-
-        # Stats
-        stats = {
-            "total": Article.objects.filter(is_deleted=False).count(),
-            "published": Article.objects.filter(
-                is_published=True, is_deleted=False
-            ).count(),
-            "draft": Article.objects.filter(
-                is_published=False, is_deleted=False
-            ).count(),
-            "deleted": Article.objects.filter(is_deleted=True).count(),
-            "total_views": total_views,
-        }
+        # Stats (one conditional-aggregation query, cached between writes)
+        stats = get_article_stats()
 
         return paginator.get_paginated_response(
             {
@@ -232,20 +273,30 @@ class ArticleListView(APIView):
 # -------------------------
 # LATEST ARTICLES WITH LIMIT
 # -------------------------
-class LatestArticlesView(APIView):
+class LatestArticlesView(CachedResponseMixin, APIView):
     permission_classes = [permissions.AllowAny]
+    cache_tags = ("articles", "authors", "categories", "comments", "bookmarks")
+
+    def get_articles(self, request):
+        articles, serializer_class = select_article_representation(
+            request,
+            Article.objects.for_listing().filter(is_published=True, is_deleted=False),
+        )
+        return articles.order_by("-created_at"), serializer_class
 
     def get(self, request):
         # Get limit from query params, default to 10
         limit = int(request.GET.get("limit", 10))
 
-        articles = (
-            Article.objects.filter(is_published=True, is_deleted=False)
-            .select_related("author", "category")
-            .order_by("-created_at")[:limit]
-        )
+        articles, serializer_class = self.get_articles(request)
 
-        serializer = ArticleSerializer(articles, many=True)
+        fast_serializer_class = get_fast_serializer(serializer_class)
+        if fast_serializer_class:
+            articles = fast_serializer_class.values(articles)
+            serializer_class = fast_serializer_class
+        articles = articles[:limit]
+
+        serializer = serializer_class(articles, many=True)
 
         return success_response(
             {"articles": serializer.data, "count": articles.count(), "limit": limit},
@@ -258,6 +309,12 @@ class LatestArticlesView(APIView):
 # -------------------------
 class ArticleSearchView(APIView):
     permission_classes = []
+    cursor_ordering = ("-created_at", "-id")
+
+    def get_articles(self, request, query, ranked=True):
+        articles = Article.objects.for_listing().filter(is_published=True)
+        articles, serializer_class = select_article_representation(request, articles)
+        return get_search_backend().search(articles, query, ranked=ranked), serializer_class
 
     def get(self, request):
         query = request.GET.get("q", "").strip()
@@ -271,26 +328,39 @@ class ArticleSearchView(APIView):
                 }
             )
 
-        # Search across multiple fields
-        articles = (
-            Article.objects.filter(
-                Q(title__icontains=query)
-                | Q(excerpt__icontains=query)
-                | Q(content__icontains=query)
-                | Q(category__name__icontains=query)
-                | Q(author__user__fullname__icontains=query)
+        cursor = use_cursor_pagination(request)
+        articles, serializer_class = self.get_articles(request, query, ranked=not cursor)
+
+        if cursor:
+            # Keyset pages need a stable key, so cursor mode orders by date
+            paginator = KeysetPagination(self.cursor_ordering)
+            page = paginator.paginate_queryset(articles, request)
+            serializer = serializer_class(page, many=True)
+
+            return Response(
+                {
+                    "success": True,
+                    "data": serializer.data,
+                    "message": f"Search results for '{query}'",
+                    "next": paginator.get_next_link(),
+                    "previous": paginator.get_previous_link(),
+                }
             )
-            .filter(is_published=True)
-            .order_by("-created_at")
-        )
 
-        serializer = ArticleSerializer(articles, many=True)
+        # Best matches first, paginated
+        paginator = ArticlePagination()
+        page = paginator.paginate_queryset(articles, request)
+        serializer = serializer_class(page, many=True)
+        count = paginator.page.paginator.count
 
         return Response(
             {
                 "success": True,
                 "data": serializer.data,
-                "message": f"Found {articles.count()} results for '{query}'",
+                "message": f"Found {count} results for '{query}'",
+                "count": count,
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
             }
         )
 
@@ -302,26 +372,30 @@ class IncrementArticleViews(APIView):
     permission_classes = []  # Allow anyone to increment views
 
     def post(self, request, article_id):
-        try:
-            article = get_object_or_404(Article, id=article_id)
-            article.view_count += 1
-            article.save()
-
-            return Response(
-                {
-                    "success": True,
-                    "message": "View count incremented",
-                    "view_count": article.view_count,
-                },
-                status=status.HTTP_200_OK,
-            )
-
-        except Article.DoesNotExist:
+        view_count = (
+            Article.objects.filter(id=article_id)
+            .values_list("view_count", flat=True)
+            .first()
+        )
+        if view_count is None:
             return Response(
                 {"success": False, "message": "Article not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
+        # Buffered; written to the database in batches
+        view_buffer = get_view_buffer()
+        view_buffer.record(article_id)
+
+        return Response(
+            {
+                "success": True,
+                "message": "View count incremented",
+                "view_count": view_count + view_buffer.pending(article_id),
+            },
+            status=status.HTTP_200_OK,
+        )
+
 
 # --------------------------------
 # ARTICLE UPDATE VIEW
@@ -340,10 +414,7 @@ class ArticleUpdateView(APIView):
 
         # 1️⃣ Fetch article
         try:
-            article = Article.objects.select_related(
-                'author__user',
-                'category'
-            ).get(id=article_id, is_deleted=False)
+            article = Article.objects.for_listing().get(id=article_id, is_deleted=False)
         except Article.DoesNotExist:
             return error_response("Article not found", code=status.HTTP_404_NOT_FOUND)
 
@@ -362,7 +433,9 @@ class ArticleUpdateView(APIView):
         data = request.data.copy()
 
         # Restrict fields for authors
-        allowed_fields_for_author = ['title', 'excerpt', 'content', 'category', 'featured_image', 'is_published']
+        allowed_fields_for_author = [
+            'title', 'excerpt', 'content', 'category', 'featured_image', 'featured_image_upload', 'is_published'
+        ]
         if not user.is_admin:
             for field in list(data.keys()):
                 if field not in allowed_fields_for_author:
@@ -378,25 +451,45 @@ class ArticleUpdateView(APIView):
                 return error_response({"category": "Invalid category ID"},
                                       code=status.HTTP_400_BAD_REQUEST)
 
-        # Save old image so we can delete it later
-        old_image_path = article.featured_image.path if article.featured_image else None
+        # A finished chunked upload can stand in for a multipart featured_image
+        upload = None
+        if data.get('featured_image_upload'):
+            upload = take_upload(user, data['featured_image_upload'])
+            if upload is None:
+                return error_response("Validation error",
+                                      {"featured_image_upload": ["No finished upload with this id"]},
+                                      code=status.HTTP_400_BAD_REQUEST)
+        image_changed = 'featured_image' in data or upload is not None
+
+        # Save old image (and its resized copies) so we can release them later
+        old_image = article.featured_image.name if article.featured_image else None
+        old_variants = article.image_variants
 
         # 5️⃣ Deserialize
         serializer = ArticleSerializer(article, data=data, partial=partial, context={'request': request})
 
         if serializer.is_valid():
             try:
-                updated_article = serializer.save()
-
-                # Delete old image if replaced
-                if 'featured_image' in data and old_image_path:
-                    if os.path.exists(old_image_path):
-                        os.remove(old_image_path)
+                if image_changed:
+                    save_kwargs = {"image_variants": {}}
+                    if upload:
+                        save_kwargs["featured_image"] = upload.image
+                    with transaction.atomic():
+                        updated_article = serializer.save(**save_kwargs)
+                        if upload:
+                            upload.delete()
+                    schedule_variants(updated_article)
+                else:
+                    updated_article = serializer.save()
+
+                # Delete old image if replaced and no other article shares the file
+                if image_changed and old_image and old_image != updated_article.featured_image.name:
+                    release_image(old_image, old_variants)
 
                 # Fetch with relations
-                updated_article_with_relations = Article.objects.select_related(
-                    'author__user', 'category'
-                ).get(id=updated_article.id)
+                updated_article_with_relations = Article.objects.for_listing().get(
+                    id=updated_article.id
+                )
 
                 return success_response(
                     ArticleSerializer(updated_article_with_relations, context={'request': request}).data,
@@ -434,7 +527,12 @@ class ArticleDeleteByIdView(APIView):
 
         # HARD DELETE - completely remove from database
         article_id = article.id
-        article.delete()
+        image = article.featured_image.name if article.featured_image else None
+        variants = article.image_variants
+        with transaction.atomic():
+            article.delete()
+            # Files are shared by content; release_image keeps any still referenced
+            transaction.on_commit(lambda: release_image(image, variants))
 
         return Response(
             {
@@ -449,17 +547,34 @@ class ArticleDeleteByIdView(APIView):
 # -------------------------
 # ARTICLE DETAIL VIEW BY SLUG WITH VIEW COUNT INCREMENT
 # -------------------------
-class ArticleDetailView(APIView):
+class ArticleDetailView(ArticleConditionalMixin, CachedResponseMixin, APIView):
     permission_classes = [permissions.AllowAny]
+    cache_tags = ("articles", "authors", "categories", "comments", "bookmarks")
+    conditional_aggregates = {
+        **ArticleConditionalMixin.conditional_aggregates,
+        "id": Max("id"),
+    }
+
+    def get_conditional_queryset(self, request, slug):
+        return Article.objects.filter(slug=slug, is_published=True, is_deleted=False)
+
+    def on_not_modified(self, request, values, slug):
+        # Revalidated and cached responses still count as views
+        get_view_buffer().record(values["id"])
+
+    def on_cache_hit(self, request, extra, slug):
+        get_view_buffer().record(extra["article_id"])
 
     def get(self, request, slug):
         article = get_object_or_404(
-            Article, slug=slug, is_published=True, is_deleted=False
+            Article.objects.for_listing(), slug=slug, is_published=True, is_deleted=False
         )
 
-        # Increment view count
-        Article.objects.filter(pk=article.pk).update(view_count=F("view_count") + 1)
-        article.refresh_from_db()
+        # Increment view count (buffered, written to the database in batches)
+        view_buffer = get_view_buffer()
+        view_buffer.record(article.pk)
+        article.view_count += view_buffer.pending(article.pk)
+        self.cache_extra["article_id"] = article.pk
 
         serializer = ArticleSerializer(article)
         return Response(
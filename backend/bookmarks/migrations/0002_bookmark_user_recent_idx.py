@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_article_indexes'),
+        ('bookmarks', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookmark',
+            index=models.Index(fields=['user', '-created_at'], name='bookmark_user_recent_idx'),
+        ),
+    ]
@@ -12,6 +12,9 @@ class Bookmark(models.Model):
     class Meta:
         unique_together = ("user", "article")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="bookmark_user_recent_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.fullname} bookmarked {self.article.title}"
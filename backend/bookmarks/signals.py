@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from blog.counters import adjust_counter
+from blog.trending import record_event
+
+from .models import Bookmark
+
+
+@receiver(post_save, sender=Bookmark)
+def trend_bookmark(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        record_event(instance.article_id, "bookmark")
+
+
+@receiver(post_save, sender=Bookmark)
+def count_bookmark(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        adjust_counter(instance.article_id, "bookmark_count", 1)
+
+
+@receiver(post_delete, sender=Bookmark)
+def uncount_bookmark(sender, instance, **kwargs):
+    adjust_counter(instance.article_id, "bookmark_count", -1)
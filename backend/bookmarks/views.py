@@ -1,6 +1,7 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from .models import Bookmark
 from .serializers import BookmarkSerializer
@@ -29,11 +30,14 @@ def error_response(message="Error", errors=None, code=status.HTTP_400_BAD_REQUES
 class BookmarkListCreateView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_bookmarks(self, user):
+        return Bookmark.objects.filter(user=user)
+
     def get(self, request):
         """
         ✅ List all bookmarks for the logged-in user
         """
-        bookmarks = Bookmark.objects.filter(user=request.user)
+        bookmarks = self.get_bookmarks(request.user)
         serializer = BookmarkSerializer(bookmarks, many=True)
         return success_response(serializer.data, "Bookmarks fetched successfully")
 
@@ -43,7 +47,9 @@ class BookmarkListCreateView(APIView):
         """
         serializer = BookmarkSerializer(data=request.data, context={"request": request})
         if serializer.is_valid():
-            bookmark = serializer.save()
+            # The article's bookmark_count is bumped in the same transaction
+            with transaction.atomic():
+                bookmark = serializer.save()
             return success_response(
                 BookmarkSerializer(bookmark).data,
                 "Bookmark created successfully",
@@ -1,8 +1,13 @@
 from rest_framework import serializers
 from .models import Category
+from core.utils.fast_serializers import FastSerializer
 
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'slug', 'icon_name']
         read_only_fields = ['id', 'slug']
+
+
+class CategoryFastSerializer(FastSerializer):
+    serializer_class = CategorySerializer
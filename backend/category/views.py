@@ -5,9 +5,13 @@ from rest_framework import status, permissions
 from django.shortcuts import get_object_or_404
 from rest_framework.pagination import PageNumberPagination
 from .models import Category
-from .serializers import CategorySerializer
+from .serializers import CategoryFastSerializer, CategorySerializer
 from blog.models import Article
-from blog.serializers import ArticleSerializer
+from blog.serializers import select_article_representation
+from blog.views import ArticleConditionalMixin
+from core.utils.cache import CachedResponseMixin
+from core.utils.fast_serializers import use_fast_serialization
+from core.utils.pagination import KeysetPagination, use_cursor_pagination
 
 # ------------------------
 # Create Category (Admin Only)
@@ -150,7 +154,21 @@ class CategoryDeleteAPIView(APIView):
 # ------------------------
 # Get All Articles by Category ID
 # ------------------------
-class ArticlesByCategoryAPIView(APIView):
+class ArticlesByCategoryAPIView(ArticleConditionalMixin, CachedResponseMixin, APIView):
+    cache_tags = ("articles", "authors", "categories", "comments", "bookmarks")
+    cursor_ordering = ("-created_at", "-id")
+
+    def get_conditional_queryset(self, request, category_id):
+        return Article.objects.filter(category_id=category_id, is_published=True, is_deleted=False)
+
+    def get_articles(self, request, category_id):
+        # Published articles in the category
+        articles = Article.objects.for_listing().filter(
+            category_id=category_id,
+            is_published=True,
+            is_deleted=False
+        ).order_by('-created_at')
+        return select_article_representation(request, articles)
 
     def get(self, request, category_id):
         try:
@@ -168,19 +186,17 @@ class ArticlesByCategoryAPIView(APIView):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            # Get published articles by category
-            articles = Article.objects.filter(
-                category_id=category_id,
-                is_published=True,
-                is_deleted=False
-            ).select_related('author', 'category').order_by('-created_at')
+            articles, serializer_class = self.get_articles(request, category_id)
             
-            # Pagination
-            paginator = PageNumberPagination()
-            paginator.page_size = 10
+            # Pagination (?pagination=cursor switches to keyset pages without a count)
+            if use_cursor_pagination(request):
+                paginator = KeysetPagination(self.cursor_ordering, page_size=10)
+            else:
+                paginator = PageNumberPagination()
+                paginator.page_size = 10
             result_page = paginator.paginate_queryset(articles, request)
             
-            serializer = ArticleSerializer(result_page, many=True)
+            serializer = serializer_class(result_page, many=True)
             
             # Build paginated response
             paginated_data = paginator.get_paginated_response(serializer.data).data
@@ -216,7 +232,24 @@ class ArticlesByCategoryAPIView(APIView):
 # ------------------------
 # Get Articles by Category Slug/Name
 # ------------------------
-class ArticlesByCategorySlugAPIView(APIView):
+class ArticlesByCategorySlugAPIView(ArticleConditionalMixin, APIView):
+    cursor_ordering = ("-created_at", "-id")
+
+    def get_conditional_queryset(self, request, category_slug):
+        return Article.objects.filter(
+            category__name__iexact=category_slug.replace('-', ' '),
+            is_published=True,
+            is_deleted=False,
+        )
+
+    def get_articles(self, request, category):
+        # Published articles in the category
+        articles = Article.objects.for_listing().filter(
+            category=category,
+            is_published=True,
+            is_deleted=False
+        ).order_by('-created_at')
+        return select_article_representation(request, articles)
 
     def get(self, request, category_slug):
         try:
@@ -236,19 +269,17 @@ class ArticlesByCategorySlugAPIView(APIView):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            # Get published articles by category
-            articles = Article.objects.filter(
-                category=category,
-                is_published=True,
-                is_deleted=False
-            ).select_related('author', 'category').order_by('-created_at')
+            articles, serializer_class = self.get_articles(request, category)
             
-            # Pagination
-            paginator = PageNumberPagination()
-            paginator.page_size = 10
+            # Pagination (?pagination=cursor switches to keyset pages without a count)
+            if use_cursor_pagination(request):
+                paginator = KeysetPagination(self.cursor_ordering, page_size=10)
+            else:
+                paginator = PageNumberPagination()
+                paginator.page_size = 10
             result_page = paginator.paginate_queryset(articles, request)
             
-            serializer = ArticleSerializer(result_page, many=True)
+            serializer = serializer_class(result_page, many=True)
             
             # Build paginated response
             paginated_data = paginator.get_paginated_response(serializer.data).data
@@ -291,8 +322,9 @@ class CategoryPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class CategoryListAPIView(APIView):
+class CategoryListAPIView(CachedResponseMixin, APIView):
     permission_classes = [permissions.AllowAny]
+    cache_tags = ("categories",)
 
     def get(self, request):
         try:
@@ -332,13 +364,17 @@ class CategoryListAPIView(APIView):
 
 
 # For all categories (dropdowns, forms)
-class CategoryDropdownAPIView(APIView):
+class CategoryDropdownAPIView(CachedResponseMixin, APIView):
     permission_classes = [permissions.AllowAny]
+    cache_tags = ("categories",)
 
     def get(self, request):
         try:
             categories = Category.objects.filter(is_active=True).order_by("name")
-            serializer = CategorySerializer(categories, many=True)
+            if use_fast_serialization():
+                serializer = CategoryFastSerializer(CategoryFastSerializer.values(categories))
+            else:
+                serializer = CategorySerializer(categories, many=True)
             
             return Response({
                 "success": True,
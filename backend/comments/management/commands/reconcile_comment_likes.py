@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from comments.models import Comment
+
+
+class Command(BaseCommand):
+    help = "Recompute Comment.likes_count from the likes table"
+
+    def handle(self, *args, **options):
+        Like = Comment.likes.through
+        actual = Coalesce(
+            Subquery(
+                Like.objects.filter(comment=OuterRef("pk"))
+                .order_by()
+                .values("comment")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+        # Only touch rows that drifted (e.g. likes removed by deleting a user)
+        fixed = (
+            Comment.objects.annotate(actual=actual)
+            .exclude(likes_count=actual)
+            .update(likes_count=actual)
+        )
+        self.stdout.write(self.style.SUCCESS(f"Fixed like counts on {fixed} comments"))
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:38
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_likes_count(apps, schema_editor):
+    Comment = apps.get_model("comments", "Comment")
+    Like = Comment.likes.through
+    Comment.objects.update(
+        likes_count=Coalesce(
+            Subquery(
+                Like.objects.filter(comment=OuterRef("pk"))
+                .order_by()
+                .values("comment")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_likes_count, migrations.RunPython.noop),
+    ]
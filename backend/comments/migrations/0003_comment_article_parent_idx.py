@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_article_indexes'),
+        ('comments', '0002_comment_likes_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['article', 'parent', '-created_at'], name='comment_article_parent_idx'),
+        ),
+    ]
@@ -11,10 +11,16 @@ class Comment(models.Model):
     parent = models.ForeignKey("self", on_delete=models.CASCADE, null=True, blank=True, related_name="replies")
     content = models.TextField()
     likes = models.ManyToManyField(User, related_name="liked_comments", blank=True)
+    # Denormalized len(likes), kept in step by LikeCommentView
+    likes_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # An article's threads, or the replies under one comment
+            models.Index(fields=["article", "parent", "-created_at"], name="comment_article_parent_idx"),
+        ]
 
     def __str__(self):
         return f"Comment by {self.user} on {self.article}"
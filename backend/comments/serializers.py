@@ -13,11 +13,17 @@ class ReplySerializer(serializers.ModelSerializer):
 class CommentSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
     replies = ReplySerializer(many=True, read_only=True)
-    likes_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Comment
         fields = ['id', 'user', 'article', 'content', 'created_at', 'likes_count', 'replies']
+        read_only_fields = ['likes_count']
 
-    def get_likes_count(self, obj):
-        return obj.likes.count()
+
+class CommentTreeSerializer(CommentSerializer):
+    """A comment with its replies nested to any depth, from load_comment_tree()."""
+
+    replies = serializers.SerializerMethodField()
+
+    def get_replies(self, obj):
+        return CommentTreeSerializer(obj.children, many=True, context=self.context).data
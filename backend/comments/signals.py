@@ -0,0 +1,44 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from blog.counters import adjust_counter
+from blog.trending import record_event, record_events
+from core.utils.cache import invalidate_tags
+
+from .models import Comment
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    invalidate_tags("comments")
+
+
+@receiver(post_save, sender=Comment)
+def count_comment(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        adjust_counter(instance.article_id, "comment_count", 1)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_comment(sender, instance, **kwargs):
+    # Also sent for every reply removed along with its parent
+    adjust_counter(instance.article_id, "comment_count", -1)
+
+
+@receiver(post_save, sender=Comment)
+def trend_comment(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        record_event(instance.article_id, "comment")
+
+
+@receiver(m2m_changed, sender=Comment.likes.through)
+def trend_comment_likes(sender, instance, action, reverse, pk_set, **kwargs):
+    if action != "post_add" or not pk_set:
+        return
+    if reverse:
+        # user.liked_comments.add(...): pk_set holds comment ids
+        article_ids = Comment.objects.filter(pk__in=pk_set).values_list("article_id", flat=True)
+        record_events((article_id, "like", 1, None) for article_id in article_ids)
+    else:
+        record_event(instance.article_id, "like", len(pk_set))
@@ -1,3 +1,58 @@
-from django.test import TestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from authors.models import Author
+from blog.models import Article
+from users.models import User
+
+from .models import Comment
+
+
+class CommentPageTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(email="author@example.com", fullname="Author", is_author=True)
+        cls.user = user
+        cls.article = Article.objects.create(
+            title="Discussed", slug="discussed", content="Body",
+            author=Author.objects.create(user=user), is_published=True,
+        )
+        cls.threads = []
+        for index in range(5):
+            root = Comment.objects.create(article=cls.article, user=user, content=f"Comment {index}")
+            reply = Comment.objects.create(article=cls.article, user=user, content=f"Reply {index}", parent=root)
+            Comment.objects.create(article=cls.article, user=user, content=f"Nested {index}", parent=reply)
+            cls.threads.append(root)
+
+    def get_page(self, page_size):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/comments/{self.article.pk}/comments/?page_size={page_size}")
+        self.assertEqual(response.status_code, 200)
+        return response.json(), queries
+
+    def test_page_loads_only_its_threads(self):
+        data, queries = self.get_page(2)
+        self.assertEqual(data["count"], 5)
+        self.assertEqual([comment["content"] for comment in data["data"]], ["Comment 4", "Comment 3"])
+        reply = data["data"][0]["replies"][0]
+        self.assertEqual((reply["content"], reply["replies"][0]["content"]), ("Reply 4", "Nested 4"))
+
+        # The roots are cut with LIMIT and replies fetched by parent, never
+        # every comment of the article
+        selects = [
+            query["sql"] for query in queries
+            if Comment._meta.db_table in query["sql"] and "COUNT(" not in query["sql"]
+        ]
+        self.assertIn("LIMIT", selects[0])
+        for sql in selects[1:]:
+            self.assertIn('"parent_id" IN', sql)
+
+    def test_queries_do_not_grow_with_the_page(self):
+        _, small = self.get_page(1)
+        with self.assertNumQueries(len(small)):
+            self.get_page(5)
+
+    def test_unpaged_returns_every_thread(self):
+        response = self.client.get(f"/api/comments/{self.article.pk}/comments/")
+        self.assertEqual(len(response.json()), 5)
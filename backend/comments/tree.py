@@ -0,0 +1,63 @@
+from .models import Comment
+
+# Newest first, for top-level comments and replies alike
+ORDERING = ("-created_at", "-id")
+
+
+def comments_of(article_id):
+    """Every comment of an article, replies included, newest first."""
+    return Comment.objects.filter(article_id=article_id).select_related("user").order_by(*ORDERING)
+
+
+def load_comment_tree(article_id):
+    """
+    Load every comment of an article in one query (user joined) and link
+    them into trees in memory. Returns the top-level
+    comments, newest first; each comment's ``children`` holds its replies
+    at any depth, in the same order.
+    """
+    comments = list(comments_of(article_id))
+
+    by_id = {}
+    for comment in comments:
+        comment.children = []
+        by_id[comment.id] = comment
+
+    roots = []
+    for comment in comments:
+        if comment.parent_id is None:
+            roots.append(comment)
+        elif comment.parent_id in by_id:
+            by_id[comment.parent_id].children.append(comment)
+    return roots
+
+
+def top_level_comments(article_id):
+    """An article's top-level comments, newest first, for paging in SQL."""
+    return (
+        Comment.objects.filter(article_id=article_id, parent__isnull=True)
+        .select_related("user")
+        .order_by(*ORDERING)
+    )
+
+
+def replies_of(comment_ids):
+    """Direct replies to ``comment_ids``, newest first."""
+    return Comment.objects.filter(parent_id__in=comment_ids).select_related("user").order_by(*ORDERING)
+
+
+def attach_replies(roots):
+    """
+    Fill ``children`` on ``roots`` and their replies at any depth, one
+    query per level of nesting, loading only the replies under ``roots``.
+    """
+    level = list(roots)
+    for comment in level:
+        comment.children = []
+    while level:
+        by_id = {comment.id: comment for comment in level}
+        level = list(replies_of(by_id))
+        for comment in level:
+            comment.children = []
+            by_id[comment.parent_id].children.append(comment)
+    return roots
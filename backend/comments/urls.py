@@ -1,10 +1,11 @@
 from django.urls import path
-from .views import CommentDetailView, CommentView, ReplyView, LikeCommentView
+from .views import CommentDetailView, CommentView, ReplyView, LikeCommentView, LikedCommentsView
 
 urlpatterns = [
     path('<int:article_id>/comments/', CommentView.as_view(), name='article-comments'),
     path('<int:comment_id>/reply/', ReplyView.as_view(), name='comment-reply'),
     path('<int:comment_id>/like/', LikeCommentView.as_view(), name='comment-like'),
+    path('liked/', LikedCommentsView.as_view(), name='comments-liked'),
     path('comments/<int:comment_id>/', CommentDetailView.as_view(), name='comment-detail'),
 
 ]
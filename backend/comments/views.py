@@ -2,17 +2,29 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from .models import Comment
-from .serializers import CommentSerializer
+from .serializers import CommentSerializer, CommentTreeSerializer
+from .tree import attach_replies, load_comment_tree, top_level_comments
 from blog.models import Article
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed
 from django.shortcuts import get_object_or_404
+from core.utils.pagination import CustomPagination
 
 
 class CommentView(APIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
     def get(self, request, article_id):
-        comments = Comment.objects.filter(article_id=article_id, parent__isnull=True)
-        serializer = CommentSerializer(comments, many=True)
+        # Top-level threads are paged only when a page is requested; the page
+        # is cut in SQL and only its replies are loaded
+        if "page" in request.GET or "page_size" in request.GET:
+            paginator = CustomPagination()
+            page = paginator.paginate_queryset(top_level_comments(article_id), request, view=self)
+            serializer = CommentTreeSerializer(attach_replies(page), many=True)
+            return paginator.get_paginated_response(serializer.data)
+
+        serializer = CommentTreeSerializer(load_comment_tree(article_id), many=True)
         return Response(serializer.data)
 
     def post(self, request, article_id):
@@ -22,7 +34,9 @@ class CommentView(APIView):
 
         serializer = CommentSerializer(data=data)
         if serializer.is_valid():
-            serializer.save(user=user)
+            # The article's comment_count is bumped in the same transaction
+            with transaction.atomic():
+                serializer.save(user=user)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -41,7 +55,8 @@ class ReplyView(APIView):
 
         serializer = CommentSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(user=user, article=parent_comment.article, parent=parent_comment)
+            with transaction.atomic():
+                serializer.save(user=user, article=parent_comment.article, parent=parent_comment)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -50,15 +65,54 @@ class LikeCommentView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, comment_id):
-        comment = Comment.objects.get(id=comment_id)
+        comment = get_object_or_404(Comment.objects.only("id", "article_id"), id=comment_id)
         user = request.user
-
-        if user in comment.likes.all():
-            comment.likes.remove(user)
-            return Response({"message": "Comment unliked."})
-        else:
-            comment.likes.add(user)
-            return Response({"message": "Comment liked."})
+        Like = Comment.likes.through
+        comments = Comment.objects.filter(id=comment.id)
+
+        # The (comment, user) unique index answers both the delete and the
+        # insert; likes_count moves by exactly the rows changed
+        with transaction.atomic():
+            removed, _ = Like.objects.filter(comment_id=comment.id, user_id=user.id).delete()
+            if removed:
+                comments.update(likes_count=F("likes_count") - removed)
+                liked = False
+            else:
+                _, liked = Like.objects.get_or_create(comment_id=comment.id, user_id=user.id)
+                if liked:
+                    comments.update(likes_count=F("likes_count") + 1)
+                    # What comment.likes.add() would send (trending, caches)
+                    m2m_changed.send(
+                        sender=Like, action="post_add", instance=comment, reverse=False,
+                        model=type(user), pk_set={user.id}, using=comments.db,
+                    )
+
+        likes_count = comments.values_list("likes_count", flat=True).first()
+        if liked:
+            return Response({"message": "Comment liked.", "liked": True, "likes_count": likes_count})
+        return Response({"message": "Comment unliked.", "liked": False, "likes_count": likes_count})
+
+
+class LikedCommentsView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    max_ids = 200
+
+    def get(self, request):
+        """?ids=1,2,3 -> which of these comments the current user has liked"""
+        try:
+            ids = [int(value) for value in request.GET.get("ids", "").split(",") if value.strip()]
+        except ValueError:
+            return Response({"detail": "ids must be a comma separated list of comment ids."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.max_ids:
+            return Response({"detail": f"At most {self.max_ids} ids per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        liked = set(
+            Comment.likes.through.objects.filter(user_id=request.user.id, comment_id__in=ids)
+            .values_list("comment_id", flat=True)
+        )
+        return Response({"success": True, "data": {str(comment_id): comment_id in liked for comment_id in ids}})
 
 
 class CommentDetailView(APIView):
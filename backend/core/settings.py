@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 
     # Third-party
     "rest_framework",
@@ -168,6 +169,13 @@ STATIC_URL = "static/"
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR)
 
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    # Article images are stored once per content digest (core/utils/storage.py)
+    "article_images": {"BACKEND": "core.utils.storage.ContentAddressedStorage"},
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -210,3 +218,118 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_ALL_ORIGINS = True
+
+# Buffered article view counter (see blog/view_counter.py). With REDIS_URL
+# set, pending views live in Redis and `manage.py flush_view_counts` can
+# write them; LocalViewBuffer keeps them in each worker process.
+BLOG_VIEW_COUNTER = {
+    "BACKEND": (
+        "blog.view_counter.RedisViewBuffer" if os.environ.get("REDIS_URL")
+        else "blog.view_counter.LocalViewBuffer"
+    ),
+    "REDIS_URL": os.environ.get("REDIS_URL"),
+    "FLUSH_INTERVAL": 5,  # seconds between background flushes
+    "FLUSH_THRESHOLD": 1000,  # pending views that trigger an immediate flush
+    "BATCH_SIZE": 500,  # rows per UPDATE statement
+}
+
+# Seconds the article list stats snapshot is cached (0 disables). Like the
+# response cache, it is only used with a shared cache (REDIS_URL).
+BLOG_ARTICLE_STATS_CACHE_TIMEOUT = 60
+
+# Article search backend (dotted path). None picks the Postgres tsvector
+# backend on Postgres and plain icontains matching elsewhere; use
+# "blog.search.backends.InvertedIndexSearchBackend" for the in-process index.
+BLOG_SEARCH_BACKEND = None
+BLOG_SEARCH_INDEX_PATH = os.path.join(BASE_DIR, "search_index", "articles.idx")
+# Change log entries after which the index folds them into a new segment
+BLOG_SEARCH_INDEX_COMPACT_AFTER = 1000
+
+# Build hot list responses straight from values() rows (core/utils/fast_serializers.py)
+FAST_SERIALIZATION = True
+
+# Set REDIS_URL (e.g. redis://localhost:6379/0, needs the redis package) to
+# share the cache between worker processes. The local memory fallback is
+# per process, which the response cache cannot use (see below).
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Cached public read responses (core/utils/cache.py). Entries are dropped by
+# tag when articles, authors, categories or comments change. The tag versions
+# must be shared by every process, so ENABLED None turns the cache on only
+# when ALIAS is not a per-process backend (local memory or dummy); True
+# forces it on, e.g. for a single process runserver.
+RESPONSE_CACHE = {
+    "ENABLED": None,
+    "ALIAS": "default",
+    "TIMEOUT": 300,  # seconds
+    "KEY_PREFIX": "respcache",
+}
+
+# Per-period article view rollups (see blog/rollups.py); run
+# `manage.py compact_view_rollups` daily to fold old rows into coarser periods
+BLOG_VIEW_ROLLUPS = {
+    "DAY_RETENTION": 90,  # days kept at day granularity
+    "WEEK_RETENTION": 365,  # days kept at week granularity
+}
+
+# Decayed trending ranking (see blog/trending.py)
+BLOG_TRENDING = {
+    "HALF_LIFE_HOURS": 24,
+    "WEIGHTS": {"view": 1, "comment": 5, "like": 2, "bookmark": 8},
+    "SIZE": 50,  # articles kept in the cached ranking
+    "REFRESH_INTERVAL": 300,  # seconds before the ranking is rebuilt from the table
+}
+
+# Admin dashboard snapshot (see users/stats.py): served as-is for MAX_AGE
+# seconds, then served stale for up to STALE_WHILE_REVALIDATE more seconds
+# while a background thread recomputes it. MAX_AGE = 0 disables the cache.
+ADMIN_DASHBOARD_CACHE = {
+    "MAX_AGE": 30,
+    "STALE_WHILE_REVALIDATE": 270,
+}
+
+# Responsive featured image variants (see blog/images.py), built in a thread
+# pool after upload; `manage.py build_image_variants` backfills old articles
+BLOG_IMAGE_VARIANTS = {
+    "WIDTHS": [320, 640, 1024, 1600],
+    "FORMATS": ["avif", "webp"],
+    "QUALITY": {"avif": 60, "webp": 80},
+    "MAX_WORKERS": 2,
+}
+
+# Resumable chunked featured image uploads (see blog/uploads.py). Part files
+# live in DIRECTORY; `manage.py clean_image_uploads` drops abandoned ones.
+BLOG_CHUNKED_UPLOADS = {
+    "DIRECTORY": os.path.join(BASE_DIR, "uploads"),
+    "MAX_SIZE": 25 * 1024 * 1024,  # bytes
+    "MAX_PIXELS": 40_000_000,
+    "EXPIRY_HOURS": 24,
+}
+
+# Media serving (see core/utils/media.py). Only files under PREFIXES are
+# served, never the rest of MEDIA_ROOT. BACKEND "django" streams with
+# FileResponse; "x-accel-redirect" hands files to an nginx internal location,
+# e.g. `location /protected-media/articles_image_path/ { internal; alias
+# <backend>/articles_image_path/; }`; "x-sendfile" to Apache, which must
+# likewise only allow the article image directory.
+MEDIA_SERVING = {
+    "BACKEND": "django",
+    "PREFIXES": ["articles_image_path/"],
+    "ACCEL_REDIRECT_PREFIX": "/protected-media/",
+    "MAX_AGE": 3600,  # seconds, for names that are not content addressed
+}
+
+# Tests run with a view buffer that never drains at exit (see core/test_runner.py)
+TEST_RUNNER = "core.test_runner.TestRunner"
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Runs the tests with blog.view_counter.ManualViewBuffer. The configured
+    buffer drains at interpreter exit, after the test databases are dropped,
+    and would write the tests' views to the real database; tests that need
+    views written flush the buffer themselves.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.view_counter = override_settings(
+            BLOG_VIEW_COUNTER={
+                **getattr(settings, "BLOG_VIEW_COUNTER", {}),
+                "BACKEND": "blog.view_counter.ManualViewBuffer",
+            }
+        )
+        self.view_counter.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.view_counter.disable()
+        super().teardown_test_environment(**kwargs)
@@ -15,12 +15,16 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+import re
+from urllib.parse import urlsplit
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from django.conf import settings
-from django.conf.urls.static import static
+
+from core.utils.media import serve as serve_media
 
 
 urlpatterns = [
@@ -35,7 +39,14 @@ urlpatterns = [
     path("api/category/", include("category.urls")),
 ]
 
-# Serve media files during development
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Serve media files unless MEDIA_URL points at another host; see
+# core/utils/media.py for handing the bytes off to nginx or Apache
+if settings.MEDIA_URL and not urlsplit(settings.MEDIA_URL).netloc:
+    urlpatterns += [
+        re_path(
+            r"^%s(?P<path>.*)$" % re.escape(settings.MEDIA_URL.lstrip("/")),
+            serve_media,
+            {"document_root": settings.MEDIA_ROOT},
+        ),
+    ]
 
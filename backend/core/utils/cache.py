@@ -0,0 +1,194 @@
+"""
+Response cache for public read endpoints.
+
+Rendered response bytes are stored in Django's cache under a key built from
+the scheme, host and path, the normalized query string, the Accept header
+and the current version of every tag the view depends on. Invalidating a
+tag bumps its version, so stale entries are never read again and simply
+expire.
+
+Tag versions live in the cache too, so it must be shared by every process
+serving requests (Redis, memcached, database). With a per-process backend
+an invalidation would only reach the worker that made it, and the others
+would keep serving stale responses; the cache stays off there unless
+RESPONSE_CACHE["ENABLED"] forces it on.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+DEFAULTS = {
+    "ENABLED": None,  # None: on unless ALIAS is a per-process backend
+    "ALIAS": "default",
+    "TIMEOUT": 300,
+    "KEY_PREFIX": "respcache",
+}
+
+LOCAL_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+# Names of every view using CachedResponseMixin, for the stats surface
+cached_views = set()
+
+
+def get_setting(name):
+    return getattr(settings, "RESPONSE_CACHE", {}).get(name, DEFAULTS[name])
+
+
+def get_cache():
+    return caches[get_setting("ALIAS")]
+
+
+def is_shared(alias):
+    """Whether cache ``alias`` is seen by every process, i.e. not local memory or dummy."""
+    return settings.CACHES[alias]["BACKEND"] not in LOCAL_BACKENDS
+
+
+def is_enabled():
+    enabled = get_setting("ENABLED")
+    if enabled is None:
+        return is_shared(get_setting("ALIAS"))
+    return enabled
+
+
+def _key(*parts):
+    return ":".join([get_setting("KEY_PREFIX"), *parts])
+
+
+# -------------------------
+# TAGS
+# -------------------------
+def get_tag_versions(tags):
+    cache = get_cache()
+    keys = {tag: _key("tag", tag) for tag in tags}
+    versions = cache.get_many(keys.values())
+    missing = {key: 1 for key in keys.values() if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[keys[tag]] for tag in tags]
+
+
+def invalidate_tags(*tags):
+    cache = get_cache()
+    for tag in tags:
+        key = _key("tag", tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Unknown tag: nothing can be cached under version 1 yet, start at 2
+            cache.set(key, 2, None)
+
+
+# -------------------------
+# STATS
+# -------------------------
+def _count(view_name, outcome):
+    cache = get_cache()
+    key = _key("stats", view_name, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def get_cache_stats():
+    """Return {view name: {"hits": n, "misses": n}} for every cached view."""
+    cache = get_cache()
+    keys = {
+        (name, outcome): _key("stats", name, outcome)
+        for name in cached_views
+        for outcome in ("hits", "misses")
+    }
+    counts = cache.get_many(keys.values())
+    return {
+        name: {outcome: counts.get(keys[name, outcome], 0) for outcome in ("hits", "misses")}
+        for name in sorted(cached_views)
+    }
+
+
+def reset_cache_stats():
+    get_cache().delete_many(
+        [_key("stats", name, outcome) for name in cached_views for outcome in ("hits", "misses")]
+    )
+
+
+# -------------------------
+# VIEW MIXIN
+# -------------------------
+class CachedResponseMixin:
+    """
+    Serve GET responses of an APIView from the cache.
+
+    Only requests without credentials are cached, since these views return
+    the same payload to every visitor. Views list the tags they depend on in
+    ``cache_tags`` and can store small values alongside the entry through
+    ``self.cache_extra``; ``on_cache_hit`` receives them back.
+    """
+
+    cache_tags = ()
+    cache_timeout = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cached_views.add(cls.__name__)
+
+    def get_cache_tags(self, request, *args, **kwargs):
+        return self.cache_tags
+
+    def is_cacheable_request(self, request):
+        return request.method == "GET" and "HTTP_AUTHORIZATION" not in request.META
+
+    def get_response_cache_key(self, request, *args, **kwargs):
+        query = sorted(
+            (name, value)
+            for name, values in request.GET.lists()
+            for value in values
+        )
+        tags = sorted(self.get_cache_tags(request, *args, **kwargs))
+        parts = [
+            # Paginated payloads carry absolute next/previous links
+            request.scheme,
+            request.get_host(),
+            request.path,
+            repr(query),
+            request.META.get("HTTP_ACCEPT", ""),
+            repr(list(zip(tags, get_tag_versions(tags)))),
+        ]
+        digest = hashlib.md5("\n".join(parts).encode()).hexdigest()
+        return _key("response", digest)
+
+    def on_cache_hit(self, request, extra, *args, **kwargs):
+        pass
+
+    def dispatch(self, request, *args, **kwargs):
+        self.cache_extra = {}
+        if not is_enabled() or not self.is_cacheable_request(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        cache = get_cache()
+        name = self.__class__.__name__
+        key = self.get_response_cache_key(request, *args, **kwargs)
+        entry = cache.get(key)
+        if entry is not None:
+            _count(name, "hits")
+            content, content_type, extra = entry
+            self.on_cache_hit(request, extra, *args, **kwargs)
+            response = HttpResponse(content, content_type=content_type)
+            response["X-Cache"] = "HIT"
+            return response
+
+        _count(name, "misses")
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            if hasattr(response, "render"):
+                response.render()
+            timeout = self.cache_timeout if self.cache_timeout is not None else get_setting("TIMEOUT")
+            cache.set(key, (response.content, response["Content-Type"], self.cache_extra), timeout)
+        response["X-Cache"] = "MISS"
+        return response
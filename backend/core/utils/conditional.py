@@ -0,0 +1,76 @@
+"""
+Conditional GET (ETag) for read endpoints.
+
+The ETag comes from a single aggregate query (MAX(updated_at), COUNT, ...)
+over the rows a response is built from, so a revalidation request that
+matches costs that one query and is answered with 304 before the view
+fetches or serializes anything.
+
+No Last-Modified is sent: MAX(updated_at) does not move when a row is
+deleted or a counter is updated in place, so If-Modified-Since alone would
+answer 304 for a changed payload.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Views provide ``get_conditional_queryset`` and may extend
+    ``conditional_aggregates`` with anything else the payload depends on
+    (view counts, related rows' updated_at, ...).
+    """
+
+    conditional_aggregates = {
+        "updated_at": Max("updated_at"),
+        "count": Count("pk"),
+    }
+
+    def get_conditional_queryset(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    def get_validators(self, request, *args, **kwargs):
+        """Return (etag, aggregates), or None when nothing matches."""
+        values = self.get_conditional_queryset(request, *args, **kwargs).aggregate(
+            **self.conditional_aggregates
+        )
+        if not values.get("count"):
+            return None
+
+        # The same rows render differently per page, representation and format
+        query = sorted(
+            (name, value) for name, items in request.GET.lists() for value in items
+        )
+        payload = repr([
+            request.path,
+            query,
+            request.META.get("HTTP_ACCEPT", ""),
+            sorted((name, str(value)) for name, value in values.items()),
+        ])
+        etag = quote_etag(hashlib.md5(payload.encode()).hexdigest())
+        return etag, values
+
+    def on_not_modified(self, request, values, *args, **kwargs):
+        pass
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+
+        validators = self.get_validators(request, *args, **kwargs)
+        if validators is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        etag, values = validators
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            self.on_not_modified(request, values, *args, **kwargs)
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            response["ETag"] = etag
+        return response
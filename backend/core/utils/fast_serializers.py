@@ -0,0 +1,148 @@
+"""
+Fast read-only serialization for hot list endpoints.
+
+A FastSerializer compiles a DRF serializer class once into column
+extractors and then builds plain dicts straight from
+``queryset.values_list()`` rows, skipping model instantiation and DRF's
+per-field get_attribute/to_representation calls. The output matches the
+DRF serializer key for key, so the rendered JSON is identical.
+
+Only read-only shapes are supported: plain model fields, dotted sources
+across relations, primary-key relations, file fields and
+SerializerMethodFields whose inputs are listed in ``method_field_sources``.
+"""
+from operator import itemgetter
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import fields, relations, serializers
+from rest_framework.fields import empty
+
+SKIP = object()
+
+
+def use_fast_serialization():
+    """The fast path is opt-in per project through the FAST_SERIALIZATION setting."""
+    return getattr(settings, "FAST_SERIALIZATION", False)
+
+
+class FastSerializer:
+    serializer_class = None
+    # SerializerMethodField name -> model attributes the method reads
+    method_field_sources = {}
+
+    def __init__(self, rows, many=True, context=None):
+        # ``many`` is accepted for call compatibility with DRF serializers
+        self.rows = rows
+        self.context = context or {}
+
+    @classmethod
+    def compile(cls):
+        compiled = cls.__dict__.get("_compiled")
+        if compiled is None:
+            compiled = cls._compiled = cls._compile()
+        return compiled
+
+    @classmethod
+    def values(cls, queryset):
+        """Turn ``queryset`` into the values_list rows this serializer reads."""
+        columns, _ = cls.compile()
+        return queryset.values_list(*columns)
+
+    @classmethod
+    def _compile(cls):
+        serializer = cls.serializer_class()
+        model = serializer.Meta.model
+        columns = []
+
+        def column(lookup):
+            if lookup not in columns:
+                columns.append(lookup)
+            return columns.index(lookup)
+
+        extractors = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if isinstance(field, serializers.SerializerMethodField):
+                if name not in cls.method_field_sources:
+                    raise ImproperlyConfigured(
+                        f"{cls.__name__}.method_field_sources must list the attributes "
+                        f"{serializer.__class__.__name__}.{field.method_name} reads"
+                    )
+                positions = [(attr, column(attr)) for attr in cls.method_field_sources[name]]
+                method = getattr(type(serializer), field.method_name)
+                extractors.append((name, cls._method_extractor(method, positions)))
+                continue
+
+            if field.source == "*" or isinstance(field, serializers.BaseSerializer):
+                raise ImproperlyConfigured(f"{cls.__name__} cannot compile field '{name}'")
+            if isinstance(field, relations.RelatedField) and not isinstance(
+                field, relations.PrimaryKeyRelatedField
+            ):
+                raise ImproperlyConfigured(f"{cls.__name__} only supports primary key relations ('{name}')")
+
+            position = column("__".join(field.source_attrs))
+            extractors.append((name, cls._field_extractor(model, field, position)))
+
+        return tuple(columns), tuple(extractors)
+
+    @staticmethod
+    def _method_extractor(method, positions):
+        # Called on a serializer bound to this call's context, as DRF would
+        def extract(row, request, serializer):
+            return method(serializer, SimpleNamespace(**{attr: row[position] for attr, position in positions}))
+        return extract
+
+    @staticmethod
+    def _field_extractor(model, field, position):
+        getter = itemgetter(position)
+
+        # DRF skips a dotted source that hits a null relation unless the
+        # field allows null or has a default; plain sources render None
+        if len(field.source_attrs) > 1 and not field.allow_null and field.default is empty and not field.required:
+            none_value = SKIP
+        else:
+            none_value = None
+
+        if isinstance(field, fields.FileField):
+            storage = model._meta.get_field(field.source_attrs[0]).storage
+
+            def extract(row, request, serializer):
+                name = getter(row)
+                if not name:
+                    return None
+                url = storage.url(name)
+                return request.build_absolute_uri(url) if request is not None else url
+            return extract
+
+        # Database values for these already have the type DRF would produce
+        if isinstance(field, (relations.PrimaryKeyRelatedField, fields.CharField, fields.IntegerField, fields.BooleanField)):
+            def extract(row, request, serializer):
+                value = getter(row)
+                return none_value if value is None else value
+            return extract
+
+        to_representation = field.to_representation
+
+        def extract(row, request, serializer):
+            value = getter(row)
+            return none_value if value is None else to_representation(value)
+        return extract
+
+    @property
+    def data(self):
+        request = self.context.get("request")
+        serializer = self.serializer_class(context=self.context)
+        _, extractors = self.compile()
+        output = []
+        for row in self.rows:
+            data = {}
+            for name, extract in extractors:
+                value = extract(row, request, serializer)
+                if value is not SKIP:
+                    data[name] = value
+            output.append(data)
+        return output
@@ -0,0 +1,189 @@
+"""
+Media file serving.
+
+Only files under PREFIXES are served: MEDIA_ROOT is the backend directory
+itself, so anything else there (settings, part files, the search index)
+must never be reachable through the media URL.
+
+Responses carry a strong ETag and Last-Modified, so revalidations are
+answered with 304 before the file is opened, and single byte ranges are
+answered with 206. Content-addressed names (core/utils/storage.py) never
+change content: their digest is the ETag and they are sent with a one-year
+immutable Cache-Control. Other files get MAX_AGE.
+
+The bytes themselves go out one of three ways (MEDIA_SERVING["BACKEND"]):
+
+- "django": a FileResponse. Under a WSGI server whose wsgi.file_wrapper
+  uses sendfile (gunicorn), whole files and ranges are sent by the kernel
+  without passing through Python.
+- "x-accel-redirect": an empty response naming the file under
+  ACCEL_REDIRECT_PREFIX, for an nginx ``internal`` location to send (and
+  to answer ranges for).
+- "x-sendfile": the same with an X-Sendfile path, for Apache mod_xsendfile.
+"""
+import mimetypes
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .storage import is_content_addressed
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+DEFAULTS = {
+    "BACKEND": "django",
+    # Directories under MEDIA_ROOT that may be served; everything else is a 404
+    "PREFIXES": ["articles_image_path/"],
+    "ACCEL_REDIRECT_PREFIX": "/protected-media/",
+    "MAX_AGE": 3600,  # seconds, for names that are not content addressed
+    "BLOCK_SIZE": 64 * 1024,  # bytes per read when Python streams the file
+}
+
+BYTE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+UNSATISFIABLE = object()
+
+
+def get_setting(name):
+    return getattr(settings, "MEDIA_SERVING", {}).get(name, DEFAULTS[name])
+
+
+class RangeFile:
+    """
+    Read at most ``length`` bytes of an open file, starting at ``start``.
+
+    The file is left positioned at ``start`` and its descriptor exposed, so
+    a server that sendfile()s from the current offset for Content-Length
+    bytes (gunicorn) sends the range without copying it through Python.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single-range header, UNSATISFIABLE, or None
+    when the whole file should be sent (no header, several ranges, or an
+    invalid one such as bytes=5-3, which RFC 9110 says to ignore).
+    """
+    match = BYTE_RANGE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range: the last N bytes
+        length = int(last)
+        if not length:
+            return UNSATISFIABLE
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return UNSATISFIABLE
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def get_etag(path, stat):
+    if is_content_addressed(path):
+        return quote_etag(Path(path).stem)
+    return quote_etag(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+
+
+def file_response(request, fullpath, path, stat, etag, content_type):
+    backend = get_setting("BACKEND")
+    if backend == "x-accel-redirect":
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = quote(get_setting("ACCEL_REDIRECT_PREFIX") + path)
+        return response
+    if backend == "x-sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = str(fullpath)
+        return response
+
+    # A Range only applies when If-Range (if sent) still names this version
+    if_range = request.META.get("HTTP_IF_RANGE")
+    byte_range = None
+    if if_range is None or if_range in (etag, http_date(stat.st_mtime)):
+        byte_range = parse_range(request.META.get("HTTP_RANGE"), stat.st_size)
+
+    if byte_range is UNSATISFIABLE:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{stat.st_size}"
+    elif byte_range is not None:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(
+            RangeFile(fullpath.open("rb"), start, length), status=206, content_type=content_type
+        )
+        response["Content-Length"] = length
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+    else:
+        # The open file itself, so wsgi.file_wrapper can sendfile() it
+        response = FileResponse(fullpath.open("rb"), content_type=content_type)
+    response.block_size = get_setting("BLOCK_SIZE")
+    return response
+
+
+def is_servable(root, fullpath):
+    """Whether ``fullpath`` lies inside one of the PREFIXES directories of ``root``."""
+    for prefix in get_setting("PREFIXES"):
+        directory = Path(root, prefix).resolve()
+        if fullpath != directory and fullpath.is_relative_to(directory):
+            return True
+    return False
+
+
+def serve(request, path, document_root=None):
+    root = document_root or settings.MEDIA_ROOT
+    try:
+        fullpath = Path(safe_join(root, path)).resolve()
+    except SuspiciousFileOperation:
+        raise Http404("Not found")
+    if not is_servable(root, fullpath) or not fullpath.is_file():
+        raise Http404("Not found")
+
+    stat = fullpath.stat()
+    etag = get_etag(path, stat)
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        content_type, encoding = mimetypes.guess_type(str(fullpath))
+        response = file_response(
+            request, fullpath, path, stat, etag, content_type or "application/octet-stream"
+        )
+        if encoding:
+            response["Content-Encoding"] = encoding
+
+    if response.status_code in (200, 206, 304):
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(stat.st_mtime)
+        if is_content_addressed(path):
+            response["Cache-Control"] = IMMUTABLE
+        else:
+            response["Cache-Control"] = f"public, max-age={get_setting('MAX_AGE')}"
+    response["Accept-Ranges"] = "bytes"
+    return response
@@ -1,12 +1,19 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 class CustomPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
 
-    def get_paginated_response(self, data):
+    def get_paginated_response(self, data, extra=None):
+        # ``extra`` adds (or overrides) top-level keys, e.g. a custom message or stats
         return Response({
             "success": True,
             "message": "Data fetched successfully",
@@ -15,5 +22,120 @@ class CustomPagination(PageNumberPagination):
             "current_page": self.page.number,
             "next": self.get_next_link(),
             "previous": self.get_previous_link(),
-            "data": data
+            "data": data,
+            **(extra or {}),
+        })
+
+
+def use_cursor_pagination(request):
+    """Cursor mode is opt-in: ?pagination=cursor, or any request carrying a cursor."""
+    return (
+        request.GET.get("pagination") == "cursor"
+        or KeysetPagination.cursor_query_param in request.GET
+    )
+
+
+class KeysetPagination:
+    """
+    Cursor (keyset) pagination over a two-column ordering such as
+    ("-created_at", "-id"). Pages are fetched with a WHERE on the last seen
+    key instead of OFFSET, and no total count is computed, so every page
+    costs the same. Cursors are opaque base64-encoded JSON.
+    """
+
+    page_size = 10
+    page_size_query_param = "limit"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering=("-created_at", "-id"), page_size=None):
+        self.ordering = ordering
+        if page_size is not None:
+            self.page_size = page_size
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, obj, reverse):
+        position = [getattr(obj, name.lstrip("-")) for name in self.ordering]
+        # isoformat() keeps microseconds, which the keyset comparison needs
+        payload = json.dumps({"p": position, "r": reverse}, default=lambda value: value.isoformat())
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position = [
+                model._meta.get_field(name.lstrip("-")).to_python(value)
+                for name, value in zip(self.ordering, payload["p"], strict=True)
+            ]
+            reverse = bool(payload["r"])
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def get_page_queryset(self, queryset, position=None, reverse=False):
+        """``queryset`` ordered by the keyset and filtered to the rows after ``position``."""
+        first, second = (name.lstrip("-") for name in self.ordering)
+        descending = self.ordering[0].startswith("-")
+        # Walking backwards flips both the comparison and the ordering
+        if reverse:
+            descending = not descending
+        prefix = "-" if descending else ""
+        lookup = "lt" if descending else "gt"
+
+        queryset = queryset.order_by(prefix + first, prefix + second)
+        if position is not None:
+            first_value, second_value = position
+            queryset = queryset.filter(
+                Q(**{f"{first}__{lookup}": first_value})
+                | Q(**{first: first_value, f"{second}__{lookup}": second_value})
+            )
+        return queryset
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request, queryset.model)
+
+        queryset = self.get_page_queryset(queryset, position, reverse)
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = position is not None if not reverse else has_more
+        self.page = results
+        return results
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
         })
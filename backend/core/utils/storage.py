@@ -0,0 +1,60 @@
+"""
+Content-addressed file storage.
+
+Files are stored under the BLAKE2b digest of their bytes, in the directory
+of the name they were saved as (``articles_image_path/<digest>.jpg``).
+Saving content that is already stored returns the existing name without
+writing anything, so the same upload is kept once however often it
+arrives, and a stored name never changes content, which lets its URL be
+cached forever. Files can be shared, so callers decide when one is no
+longer referenced before deleting it.
+"""
+import hashlib
+import os
+import posixpath
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, storages
+
+DIGEST_SIZE = 16
+CONTENT_NAME = re.compile(r"^[0-9a-f]{%d}(\.[0-9a-z]+)?$" % (DIGEST_SIZE * 2))
+
+
+def content_digest(content):
+    """BLAKE2b hex digest of a File's (or open file's) bytes."""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    if hasattr(content, "chunks"):
+        chunks = content.chunks()
+    else:
+        content.seek(0)
+        chunks = iter(lambda: content.read(64 * 1024), b"")
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_name(name, digest):
+    extension = os.path.splitext(name)[1].lower()
+    return posixpath.join(posixpath.dirname(name), digest + extension)
+
+
+def is_content_addressed(name):
+    return bool(CONTENT_NAME.match(posixpath.basename(name)))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        name = content_name(self.generate_filename(name), content_digest(content))
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length=max_length)
+
+
+def article_image_storage():
+    return storages["article_images"]
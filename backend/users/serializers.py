@@ -131,7 +131,9 @@ class UserListSerializer(serializers.ModelSerializer):
         return "active" if obj.is_active else "suspended"
     
     def get_articles_count(self, obj):
-        # Assuming you have an Article model with author field
+        # UserListView annotates the count; fall back to a query otherwise
+        if getattr(obj, 'articles_count', None) is not None:
+            return obj.articles_count
         if hasattr(obj, 'author_profile'):
             return Article.objects.filter(author=obj.author_profile).count()
         return 0
@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from blog.stats import compute_article_stats
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_CACHE_KEY = "users:dashboard_stats"
+DASHBOARD_REFRESH_LOCK_KEY = "users:dashboard_stats:refreshing"
+
+DEFAULTS = {
+    "MAX_AGE": 30,
+    "STALE_WHILE_REVALIDATE": 270,
+}
+
+
+def get_setting(name):
+    return getattr(settings, "ADMIN_DASHBOARD_CACHE", {}).get(name, DEFAULTS[name])
+
+
+def compute_dashboard_stats():
+    """The admin dashboard counters: one conditional aggregate over users, one over articles."""
+    now = timezone.now()
+    week_ago = now - timedelta(days=7)
+    today_start = datetime.combine(timezone.localdate(), datetime.min.time(), tzinfo=timezone.get_current_timezone())
+
+    users = User.objects.aggregate(
+        total=Count("id"),
+        active=Count("id", filter=Q(is_active=True)),
+        admins=Count("id", filter=Q(is_admin=True)),
+        authors=Count("id", filter=Q(is_author=True)),
+        readers=Count("id", filter=Q(is_admin=False, is_author=False)),
+        new_last_7_days=Count("id", filter=Q(date_joined__gte=week_ago)),
+    )
+
+    live = Q(is_deleted=False)
+    articles = compute_article_stats(
+        today_created=Count("id", filter=live & Q(created_at__gte=today_start)),
+        last_7_days=Count("id", filter=live & Q(created_at__gte=week_ago)),
+    )
+
+    return {
+        "users": users,
+        "articles": {
+            key: articles[key]
+            for key in ("total", "published", "draft", "deleted", "total_views", "today_created", "last_7_days")
+        },
+    }
+
+
+def _refresh():
+    snapshot = {"computed_at": time.time(), "stats": compute_dashboard_stats()}
+    cache.set(DASHBOARD_CACHE_KEY, snapshot, get_setting("MAX_AGE") + get_setting("STALE_WHILE_REVALIDATE"))
+    return snapshot["stats"]
+
+
+def _refresh_in_background():
+    # Only one process/thread refreshes at a time
+    if not cache.add(DASHBOARD_REFRESH_LOCK_KEY, True, 60):
+        return
+
+    def run():
+        try:
+            _refresh()
+        except Exception:
+            logger.exception("Failed to refresh the admin dashboard snapshot")
+        finally:
+            cache.delete(DASHBOARD_REFRESH_LOCK_KEY)
+            connections.close_all()
+
+    threading.Thread(target=run, name="dashboard-stats-refresh", daemon=True).start()
+
+
+def get_dashboard_stats():
+    """
+    Dashboard counters from a cached snapshot. Snapshots younger than MAX_AGE
+    are served as they are; older ones, up to MAX_AGE + STALE_WHILE_REVALIDATE,
+    are served while a background thread recomputes them. Past that budget
+    (or with MAX_AGE = 0) the counters are computed in the request.
+    """
+    if not get_setting("MAX_AGE"):
+        return compute_dashboard_stats()
+
+    snapshot = cache.get(DASHBOARD_CACHE_KEY)
+    if snapshot is None:
+        return _refresh()
+
+    if time.time() - snapshot["computed_at"] > get_setting("MAX_AGE"):
+        _refresh_in_background()
+    return snapshot["stats"]
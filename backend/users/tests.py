@@ -1,3 +1,24 @@
-from django.test import TestCase
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from .models import User
+
+
+class UserListViewTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(15):
+            User.objects.create_user(email=f"user{index}@example.com", fullname=f"User {index}")
+
+    def test_unpaged_without_page_parameters(self):
+        response = self.client.get("/api/auth/admin/users/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["data"]), 15)
+        self.assertEqual(response.data["count"], 15)
+        self.assertEqual(response.data["stats"]["total"], 15)
+
+    def test_paged_with_page_parameters(self):
+        response = self.client.get("/api/auth/admin/users/?page=2&page_size=10")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["data"]), 5)
+        self.assertEqual((response.data["count"], response.data["current_page"]), (15, 2))
+        self.assertEqual(response.data["stats"]["total"], 15)
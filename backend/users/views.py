@@ -1,11 +1,9 @@
-from django.db.models import Q
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.utils import timezone
-from datetime import timedelta
-from django.db.models import Sum
 from .models import User
 from blog.models import Article
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -19,7 +17,9 @@ from .serializers import (
     UserListSerializer,
     UserProfileSerializer,
 )
+from core.utils.pagination import CustomPagination
 from core.utils.responses import success_response, error_response
+from .stats import get_dashboard_stats
 
 
 def get_tokens_for_user(user):
@@ -154,32 +154,46 @@ class UserListView(APIView):
                 elif status_filter == "suspended":
                     users = users.filter(is_active=False)
 
-            # Order by most recent
-            users = users.order_by("-date_joined")
-
-            # Serialize data
-            serializer = UserListSerializer(users, many=True)
+            # Order by most recent; articles_count is a correlated subquery
+            # instead of one COUNT per serialized user
+            users = users.annotate(
+                articles_count=Coalesce(Subquery(
+                    Article.objects.filter(author__user=OuterRef("pk"))
+                    .order_by()
+                    .values("author__user")
+                    .annotate(count=Count("id"))
+                    .values("count")
+                ), 0)
+            ).order_by("-date_joined", "-id")
+
+            # Role stats for all users in one conditional aggregate
+            stats = User.objects.aggregate(
+                total=Count("id"),
+                active=Count("id", filter=Q(is_active=True)),
+                authors=Count("id", filter=Q(is_author=True)),
+                admins=Count("id", filter=Q(is_admin=True)),
+                readers=Count("id", filter=Q(is_admin=False, is_author=False)),
+            )
 
-            # Get counts for frontend
-            total_count = users.count()
-            active_count = User.objects.filter(is_active=True).count()
-            authors_count = User.objects.filter(is_author=True).count()
-            admin_count = User.objects.filter(is_admin=True).count()
-            readers_count = User.objects.filter(is_admin=False, is_author=False).count()
+            # Pages only when asked for (?page / ?page_size); without them the
+            # whole list is returned, as the admin users page expects
+            paginator = CustomPagination()
+            if paginator.page_query_param in request.GET or paginator.page_size_query_param in request.GET:
+                page = paginator.paginate_queryset(users, request, view=self)
+                serializer = UserListSerializer(page, many=True)
+                return paginator.get_paginated_response(
+                    serializer.data,
+                    extra={"message": "Users retrieved successfully", "stats": stats},
+                )
 
+            serializer = UserListSerializer(users, many=True)
             return Response(
                 {
                     "success": True,
                     "message": "Users retrieved successfully",
                     "data": serializer.data,
-                    "count": total_count,
-                    "stats": {
-                        "total": User.objects.count(),
-                        "active": active_count,
-                        "authors": authors_count,
-                        "admins": admin_count,
-                        "readers": readers_count,
-                    },
+                    "count": len(serializer.data),
+                    "stats": stats,
                 },
                 status=status.HTTP_200_OK,
             )
@@ -285,67 +299,13 @@ class AdminDashboardView(APIView):
 
     def get(self, request):
         try:
-            # ======================
-            # USER STATISTICS
-            # ======================
-            total_users = User.objects.count()
-            active_users = User.objects.filter(is_active=True).count()
-            admin_users = User.objects.filter(is_admin=True).count()
-            author_users = User.objects.filter(is_author=True).count()
-            reader_users = User.objects.filter(is_admin=False, is_author=False).count()
-
-            week_ago = timezone.now() - timedelta(days=7)
-            recent_users = User.objects.filter(date_joined__gte=week_ago).count()
-
-            # ======================
-            # ARTICLE STATISTICS
-            # ======================
-            total_articles = Article.objects.filter(is_deleted=False).count()
-            published_articles = Article.objects.filter(is_published=True, is_deleted=False).count()
-            draft_articles = Article.objects.filter(is_published=False, is_deleted=False).count()
-            deleted_articles = Article.objects.filter(is_deleted=True).count()
-
-            # Sum of all article views
-            views_agg = Article.objects.filter(is_deleted=False).aggregate(total_views=Sum("view_count"))
-            total_views = views_agg.get("total_views") or 0
-
-            # New articles: today & last 7 days
-            today = timezone.now().date()
-            today_articles = Article.objects.filter(
-                created_at__date=today, is_deleted=False
-            ).count()
-
-            recent_articles = Article.objects.filter(
-                created_at__gte=week_ago, is_deleted=False
-            ).count()
-
-            # ======================
-            # FINAL STATS RESPONSE
-            # ======================
-            stats = {
-                "users": {
-                    "total": total_users,
-                    "active": active_users,
-                    "admins": admin_users,
-                    "authors": author_users,
-                    "readers": reader_users,
-                    "new_last_7_days": recent_users,
-                },
-                "articles": {
-                    "total": total_articles,
-                    "published": published_articles,
-                    "draft": draft_articles,
-                    "deleted": deleted_articles,
-                    "total_views": total_views,
-                    "today_created": today_articles,
-                    "last_7_days": recent_articles,
-                },
-            }
+            # Two conditional-aggregate queries, served from a cached snapshot
+            stats = get_dashboard_stats()
 
             return success_response(stats, "Dashboard stats retrieved successfully")
 
         except Exception as e:
             return error_response(
                 f"Error retrieving dashboard stats: {str(e)}",
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
\ No newline at end of file